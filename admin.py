@@ -1,70 +1,98 @@
 # admin.py – read-only admin dashboard (MySQL backend)
+"""
+Progress overview for admins.  Everything heavy happens in MySQL:
+
+  • search is a prefix match on username / full name, served by the
+    primary key and `idx_progress_fullname` (see migrations.py)
+  • total_tabs and percent_complete come from the materialized
+    `progress_summary` leaderboard; rank is counted for the visible rows
+    only, on `idx_summary_total` (github_progress.rank_sql)
+  • only one page (LIMIT/OFFSET over a stable ORDER BY) is fetched, and
+    only that page is styled
+  • exports (users / progress / records / grades, CSV or XLSX) stream
+    through exports.py instead of serializing a full DataFrame
+
+Page and count queries are cached for a short TTL, so reruns that do not
+change the search or page (button clicks elsewhere, widget focus …)
+do not hit the database at all.
+"""
+import numpy as np
 import streamlit as st
 import pandas as pd
-import mysql.connector
-from mysql.connector import Error
+
+from db_pool import get_conn
+from github_progress import WEEK_TABS, percent_sql, rank_sql, total_sql
+from exports import EXPORTS, FORMATS, export_file
+
+PAGE_SIZES = (25, 50, 100, 250)
+_WEEK_COLS = [f"week{wk}track" for wk in WEEK_TABS]
 
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Helpers
 # ──────────────────────────────────────────────────────────────────────────────
-def _get_conn():
-    """Connect to the MySQL database using [mysql] in secrets.toml"""
-    cfg = st.secrets["mysql"]
-    return mysql.connector.connect(
-        host=cfg["host"],
-        port=int(cfg.get("port", 3306)),
-        user=cfg["user"],
-        password=cfg["password"],
-        database=cfg["database"],
-        autocommit=False,
-    )
+def _where(search):
+    """WHERE clause + params for an index-friendly prefix search."""
+    if not search:
+        return "", ()
+    like = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    return "WHERE (p.username LIKE %s OR p.fullname LIKE %s)", (like, like)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _count_progress(search):
+    where, params = _where(search)
+    with get_conn() as conn:
+        cur = conn.cursor()
+        cur.execute(f"SELECT COUNT(*) FROM progress AS p {where}", params)
+        return cur.fetchone()[0]
 
 
-def _fetch_progress():
+@st.cache_data(ttl=30, show_spinner=False)
+def _fetch_progress(search="", page=1, page_size=PAGE_SIZES[0]):
     """
-    Returns a pandas DataFrame with:
-      username · fullname · week1 … week5 · total_tabs · percent_complete
+    Returns one page as a pandas DataFrame with:
+      username · fullname · week1 … week5 · total_tabs · percent_complete · rank
     """
-    conn = _get_conn()
-    q = """
+    where, params = _where(search)
+    q = f"""
         SELECT p.username,
                p.fullname,
-               p.week1track, p.week2track, p.week3track, p.week4track, p.week5track
+               {", ".join(f"p.{c}" for c in _WEEK_COLS)},
+               {total_sql('s')} AS total_tabs,
+               {percent_sql('s')} AS percent_complete,
+               {rank_sql('s')} AS `rank`
         FROM progress AS p
-        ORDER BY p.fullname
+        LEFT JOIN progress_summary AS s ON s.username = p.username
+        {where}
+        ORDER BY p.fullname, p.username
+        LIMIT %s OFFSET %s
     """
-    df = pd.read_sql(q, conn)
+    with get_conn() as conn:
+        cur = conn.cursor()
+        cur.execute(q, (*params, page_size, (page - 1) * page_size))
+        columns = [d[0] for d in cur.description]
+        rows = cur.fetchall()
+    df = pd.DataFrame(rows, columns=columns)
+    df["percent_complete"] = df["percent_complete"].astype(float)
+    return df
 
-    # calculate totals (assumes week1 max 10, week2 max 12, week3 max 12, week4 max 12, week5 max 7)
-    week_max = {1: 10, 2: 12, 3: 12, 4: 12, 5: 7}
-    df["total_tabs"] = (
-        df["week1track"] + df["week2track"] + df["week3track"] +
-        df["week4track"] + df["week5track"]
-    )
-    max_possible = sum(week_max.values())
-    df["percent_complete"] = (df["total_tabs"] / max_possible * 100).round(1)
-    conn.close()
-    return df, max_possible
+
+def _week_shades(block):
+    """Grey background per week cell (dark → light with progress), vectorized."""
+    maxima = np.array(list(WEEK_TABS.values()), dtype=float)
+    pct = np.clip(block.to_numpy(dtype=float) / maxima, 0, 1)
+    shade = pd.DataFrame((255 - pct * 155).astype(int).astype(str),
+                         index=block.index, columns=block.columns)
+    return "background-color: rgb(" + shade + "," + shade + "," + shade + ")"
 
 
 def _style_df(df):
-    def _bg(val, divisor):
-        pct = 0 if divisor == 0 else val / divisor
-        shade = int(255 - pct * 155)  # dark→light
-        return f"background-color: rgb({shade},{shade},{shade})"
-
-    styled = df.style
-    for wk in range(1, 6):
-        styled = styled.applymap(
-            lambda v, _div=wk: _bg(v, {1:10,2:12,3:12,4:12,5:7}[_div]),
-            subset=[f"week{wk}track"],
-        )
-    styled = styled.bar(
-        subset=["percent_complete"],
-        color="#4CAF50"
+    return (
+        df.style
+        .apply(_week_shades, axis=None, subset=_WEEK_COLS)
+        .bar(subset=["percent_complete"], color="#4CAF50", vmin=0, vmax=100)
     )
-    return styled
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -93,20 +121,29 @@ def _admin_login():
 if _admin_login():
     st.title("Participant Progress Overview")
 
-    df, max_possible = _fetch_progress()
-
-    # search/filter
-    search = st.text_input("Filter by name or username").lower().strip()
-    if search:
-        df = df[
-            df["fullname"].str.lower().str.contains(search) |
-            df["username"].str.lower().str.contains(search)
-        ]
-
-    st.subheader(f"Total participants: {len(df)}")
-    styled_df = _style_df(df)
-    st.dataframe(styled_df, use_container_width=True)
-
-    # downloadable CSV
-    csv = df.to_csv(index=False).encode("utf-8")
-    st.download_button("Download CSV", csv, "progress.csv", "text/csv")
+    # search/filter (prefix match, pushed down to MySQL)
+    search = st.text_input("Filter by name or username (starts with)").strip()
+    total = _count_progress(search)
+    st.subheader(f"Total participants: {total}")
+
+    col_size, col_page = st.columns(2)
+    page_size = col_size.selectbox("Rows per page", PAGE_SIZES)
+    pages = max(1, -(-total // page_size))
+    page = col_page.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1)
+
+    df = _fetch_progress(search, int(page), page_size)
+    first = (page - 1) * page_size + 1 if total else 0
+    st.caption(f"Showing {first}–{first + len(df) - 1 if total else 0} of {total}")
+    st.dataframe(_style_df(df), use_container_width=True)
+
+    # streamed exports – written to a temp file batch by batch (see exports.py)
+    st.subheader("Export")
+    col_what, col_fmt = st.columns(2)
+    what = col_what.selectbox("Table", sorted(EXPORTS), index=sorted(EXPORTS).index("progress"))
+    fmt = col_fmt.radio("Format", sorted(FORMATS), horizontal=True)
+    if st.button("Prepare export"):
+        with st.spinner("Writing export…"):
+            f = export_file(what, fmt, search)
+        mimetype, suffix = FORMATS[fmt]
+        with f:
+            st.download_button(f"Download {what}{suffix}", f, f"{what}{suffix}", mimetype)
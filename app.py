@@ -5,6 +5,8 @@ import functools
 import logging
 import streamlit as st
 
+from tracing import TRACE, normalize_sql, span, traced
+
 # ──────────────────────────────────────────────────────────────────────────────
 #  Debug / instrumentation toggles
 # ──────────────────────────────────────────────────────────────────────────────
@@ -22,35 +24,56 @@ if DEBUG_SQL:
 #  Monkey-patch mysql-connector so every cursor.execute() is timed
 # ──────────────────────────────────────────────────────────────────────────────
 def _patch_mysql_execute() -> None:
-    """Wrap mysql.connector.cursor.MySQLCursor.execute with a timer (once)."""
-    if not DEBUG_SQL:
+    """
+    Wrap `execute` of the pure-Python *and* C-extension cursor bases with a
+    timer + span (once).  db_pool connects with the C extension when it is
+    installed (the default), so patching MySQLCursor alone missed every
+    pooled query.
+    """
+    if not (DEBUG_SQL or TRACE):
         return
 
     import mysql.connector
     if getattr(mysql.connector, "_timed_execute_patched", False):
         return   # already patched
 
-    real_exec = mysql.connector.cursor.MySQLCursor.execute
-    timings_key = "_sql_timings"
-
-    def timed_exec(self, operation, params=None, multi=False):
-        t0 = time.perf_counter()
-        result = real_exec(self, operation, params=params, multi=multi)
-        dur_ms = (time.perf_counter() - t0) * 1000
+    from mysql.connector.cursor import MySQLCursor
+    cursor_classes = [MySQLCursor]
+    try:
+        from mysql.connector.cursor_cext import CMySQLCursor
+        cursor_classes.append(CMySQLCursor)
+    except ImportError:
+        pass   # C extension not installed
 
-        # Console log
-        logging.info("[SQL] %7.1f ms  %s", dur_ms,
-                     (operation if isinstance(operation, str) else str(operation))
-                     .split()[0])
-
-        # Optional per-query list in Streamlit session state
-        if SHOW_SQL_UI:
-            st.session_state.setdefault(timings_key, []).append(
-                (operation.split()[0], dur_ms)
-            )
-        return result
+    timings_key = "_sql_timings"
 
-    mysql.connector.cursor.MySQLCursor.execute = timed_exec
+    def timed(real_exec):
+        @functools.wraps(real_exec)
+        def timed_exec(self, operation, *args, **kwargs):
+            text = operation.decode("utf-8", "replace") \
+                if isinstance(operation, (bytes, bytearray)) else str(operation)
+            verb = (text.split() or ["?"])[0]
+            with span("sql", operation=verb.upper(),
+                      statement=normalize_sql(text) if TRACE else None) as sql_span:
+                t0 = time.perf_counter()
+                result = real_exec(self, operation, *args, **kwargs)
+                dur_ms = (time.perf_counter() - t0) * 1000
+                sql_span.set(rows=self.rowcount)
+
+            # Console log
+            if DEBUG_SQL:
+                logging.info("[SQL] %7.1f ms  %s", dur_ms, verb)
+
+            # Optional per-query list in Streamlit session state
+            if SHOW_SQL_UI:
+                st.session_state.setdefault(timings_key, []).append(
+                    (verb, dur_ms)
+                )
+            return result
+        return timed_exec
+
+    for cls in cursor_classes:
+        cls.execute = timed(cls.execute)
     mysql.connector._timed_execute_patched = True
 
 
@@ -60,7 +83,8 @@ _patch_mysql_execute()  # must run *before* any DB query occurs
 #  Regular app imports (only those that do **not** create a circular import)
 # ──────────────────────────────────────────────────────────────────────────────
 from theme           import apply_dark_theme
-from database        import create_tables      # now auto-timed
+from style_registry  import begin_render
+from database        import check_schema       # one SELECT per process
 from sidebar         import show_sidebar
 from style           import show_footer
 from importlib       import import_module
@@ -88,17 +112,21 @@ def enforce_week_gating(selected: str) -> bool:
             return True
         if week == 1:
             return True
-        required = {2: 10, 3: 12, 4: 12, 5: 7}
-        username = st.session_state.get("username", "default_user")
-        user_prog = get_user_progress(username)
-        prev_key  = f"week{week-1}"
-        return user_prog.get(prev_key, 0) >= required.get(week, 0)
+        with span("week.route", week=week) as route:
+            required  = {2: 10, 3: 12, 4: 12, 5: 7}
+            username  = st.session_state.get("username", "default_user")
+            user_prog = get_user_progress(username)
+            prev_key  = f"week{week-1}"
+            allowed   = user_prog.get(prev_key, 0) >= required.get(week, 0)
+            route.set(allowed=allowed)
+        return allowed
     return True
 
 
 # ──────────────────────────────────────────────────────────────────────────────
 #  Main Streamlit app
 # ──────────────────────────────────────────────────────────────────────────────
+@traced("request")
 def main() -> None:
     page_start = time.perf_counter()   # ⏱ build timer
 
@@ -108,8 +136,9 @@ def main() -> None:
         initial_sidebar_state="expanded",
     )
 
+    begin_render()                     # CSS bundles: once per run
     apply_dark_theme()
-    create_tables()                    # DB work (timed by patch)
+    check_schema()                     # cached; migrations run out-of-band
 
     # Always have a page key
     st.session_state.setdefault("page", "offer")
@@ -117,52 +146,53 @@ def main() -> None:
     page      = st.session_state["page"]
     logged_in = st.session_state.get("logged_in", False)
 
-    # ───────────────────────────────────────────────────────────────────────────
-    # 1) Post-login flows
-    # ───────────────────────────────────────────────────────────────────────────
-    if logged_in:
-        show_sidebar()
-
-        if page == "logout":
-            st.session_state["logged_in"] = False
-            st.session_state["page"]      = "offer"
-            safe_rerun()
-            return
-
-        if page == "home":
-            # **Lazy import eliminates any circular dependency**
-            import home as _home_module
-            _home_module.show_home()
-        else:
-            if page.startswith("modules_week") and not enforce_week_gating(page):
-                st.warning("You must complete the previous week before accessing this section.")
-                st.stop()
-            try:
-                module = import_module(page)
-                if hasattr(module, "show"):
-                    module.show()
-                else:
-                    st.warning("The selected module does not have a 'show()' function.")
-            except ImportError as e:
-                st.warning(f"Unknown selection: {e}")
+    with span("page.dispatch", page=page, logged_in=logged_in):
+        # ───────────────────────────────────────────────────────────────────────
+        # 1) Post-login flows
+        # ───────────────────────────────────────────────────────────────────────
+        if logged_in:
+            show_sidebar()
 
-    # ───────────────────────────────────────────────────────────────────────────
-    # 2) Pre-login flows
-    # ───────────────────────────────────────────────────────────────────────────
-    else:
-        if page == "offer":
-            import offer; offer.show()
-        elif page == "login":
-            import login; login.show_login_create_account()
-        elif page == "loginx":
-            st.warning("Course 2 Login is not available yet.")
-            if st.button("Go Back"):
-                st.session_state["page"] = "offer"
+            if page == "logout":
+                st.session_state["logged_in"] = False
+                st.session_state["page"]      = "offer"
                 safe_rerun()
-        elif page == "course2_app":
-            from second.appx import appx; appx.show()
+                return
+
+            if page == "home":
+                # **Lazy import eliminates any circular dependency**
+                import home as _home_module
+                _home_module.show_home()
+            else:
+                if page.startswith("modules_week") and not enforce_week_gating(page):
+                    st.warning("You must complete the previous week before accessing this section.")
+                    st.stop()
+                try:
+                    module = import_module(page)
+                    if hasattr(module, "show"):
+                        module.show()
+                    else:
+                        st.warning("The selected module does not have a 'show()' function.")
+                except ImportError as e:
+                    st.warning(f"Unknown selection: {e}")
+
+        # ───────────────────────────────────────────────────────────────────────
+        # 2) Pre-login flows
+        # ───────────────────────────────────────────────────────────────────────
         else:
-            import login; login.show_login_create_account()
+            if page == "offer":
+                import offer; offer.show()
+            elif page == "login":
+                import login; login.show_login_create_account()
+            elif page == "loginx":
+                st.warning("Course 2 Login is not available yet.")
+                if st.button("Go Back"):
+                    st.session_state["page"] = "offer"
+                    safe_rerun()
+            elif page == "course2_app":
+                from second.appx import appx; appx.show()
+            else:
+                import login; login.show_login_create_account()
 
     # ───────────────────────────────────────────────────────────────────────────
     # 3) Footer (always)
@@ -1,13 +1,11 @@
 # as1.py – MySQL version (no local .db file required)
+import hashlib
 import streamlit as st
-import folium
-import pandas as pd
-from geopy.distance import geodesic
-from io import StringIO
-from streamlit_folium import st_folium
+import streamlit.components.v1 as components
 from utils.style1 import set_page_style
-import mysql.connector
-from mysql.connector import errorcode
+from db_pool import get_conn
+from submissions import record_attempt
+from grades.sandbox import get_grading_pool
 
 # --------------------------------------------------------------------------- #
 # Optional GitHub-push stub (keeps old code paths alive without changing them)
@@ -20,18 +18,37 @@ except ModuleNotFoundError:
         return {"success": True}
 
 # --------------------------------------------------------------------------- #
-# DB helper – centralise MySQL connection
+# Code execution – run once per distinct code text, reuse for grading
 # --------------------------------------------------------------------------- #
-def _get_conn():
-    cfg = st.secrets["mysql"]
-    return mysql.connector.connect(
-        host=cfg["host"],
-        port=int(cfg.get("port", 3306)),
-        user=cfg["user"],
-        password=cfg["password"],
-        database=cfg["database"],
-        autocommit=False,
-    )
+def _run_code(code_input):
+    """
+    Run the student's code in a grading worker and cache the outcome in
+    session state under a hash of the code:
+
+        {"code_hash", "ok", "timed_out", "error", "stdout",
+         "locals", "dataframes", "maps_html"}
+
+    "Submit Code" hands this to grade1, so the geodesic/folium work is not
+    repeated.  Identical code is never run twice per session.
+    """
+    code_hash = hashlib.sha256(code_input.encode("utf-8")).hexdigest()
+    cached = st.session_state.get("as1_run_result")
+    if cached and cached["code_hash"] == code_hash:
+        return cached
+
+    result = get_grading_pool().run("grades.sandbox:run_code", code_input)
+    summary = result["value"] or {"locals": {}, "dataframes": {}, "maps_html": {}}
+    run_result = {
+        "code_hash": code_hash,
+        "ok": result["ok"],
+        "timed_out": result["timed_out"],
+        "error": result["error"],
+        "stdout": result["stdout"],
+        **summary,
+    }
+    if not result["timed_out"]:        # a busy pool may succeed on retry
+        st.session_state["as1_run_result"] = run_result
+    return run_result
 
 # --------------------------------------------------------------------------- #
 # MAIN UI
@@ -41,7 +58,7 @@ def show():
 
     for key, default in {
         "run_success":      False,
-        "map_object":       None,
+        "map_html":         None,
         "dataframe_object": None,
         "captured_output":  "",
         "username_entered": False,
@@ -135,18 +152,16 @@ def show():
             st.error("Please enter a username.")
         else:
             try:
-                conn = _get_conn()
-                cur  = conn.cursor()
-                cur.execute(
-                    "SELECT 1 FROM records WHERE username = %s LIMIT 1",
-                    (username_input,),
-                )
-                exists = cur.fetchone() is not None
+                with get_conn() as conn:
+                    cur = conn.cursor()
+                    cur.execute(
+                        "SELECT 1 FROM records WHERE username = %s LIMIT 1",
+                        (username_input,),
+                    )
+                    exists = cur.fetchone() is not None
             except Exception as e:
                 st.error(f"Error checking username: {e}")
                 exists = False
-            finally:
-                conn.close()
             if exists:
                 st.session_state["username_entered"] = True
                 st.session_state["username"]         = username_input
@@ -168,33 +183,25 @@ def show():
             st.session_state.update(
                 run_success=False,
                 captured_output="",
-                map_object=None,
+                map_html=None,
                 dataframe_object=None,
             )
-            try:
-                captured = StringIO()
-                import sys
-                old_stdout = sys.stdout
-                sys.stdout = captured
-
-                local_ctx = {}
-                exec(code_input, {}, local_ctx)
-
-                sys.stdout = old_stdout
-                st.session_state["captured_output"] = captured.getvalue()
+            # Student code runs in a grading worker process, never in the server
+            with st.spinner("Running your code..."):
+                run_result = _run_code(code_input)
+            st.session_state["captured_output"] = run_result["stdout"]
 
+            if run_result["ok"]:
                 # detect folium.Map or DataFrame
-                for obj in local_ctx.values():
-                    if isinstance(obj, folium.Map):
-                        st.session_state["map_object"] = obj
-                    elif isinstance(obj, pd.DataFrame):
-                        st.session_state["dataframe_object"] = obj
+                for html in run_result["maps_html"].values():
+                    st.session_state["map_html"] = html
+                for df in run_result["dataframes"].values():
+                    st.session_state["dataframe_object"] = df
 
                 st.session_state["run_success"] = True
                 st.success("✅ Code ran successfully!")
-            except Exception as e:
-                sys.stdout = old_stdout
-                st.error(f"Error while running code: {e}")
+            else:
+                st.error(f"Error while running code: {run_result['error']}")
 
         # show outputs if run succeeded
         if st.session_state["run_success"]:
@@ -206,18 +213,28 @@ def show():
                     "</pre>",
                     unsafe_allow_html=True,
                 )
-            if st.session_state["map_object"]:
+            if st.session_state["map_html"]:
                 st.markdown("### 🗺️ Map Output")
-                st_folium(st.session_state["map_object"], width=1000, height=500)
+                components.html(st.session_state["map_html"], width=1000, height=500)
             if st.session_state["dataframe_object"] is not None:
                 st.markdown("### 📊 DataFrame Output")
                 st.dataframe(st.session_state["dataframe_object"])
 
             # —————————————————————— Submit Code button ——————————————————————
             if st.button("Submit Code", key="submit_code"):
-                # 1. Grade the code
+                # 1. Grade the code: identical code was graded before → instant;
+                #    otherwise reuse the cached run (re-runs only if the code
+                #    was edited after "Run Code")
                 from grades.grade1 import grade_assignment
-                grade = grade_assignment(code_input)
+                from grades import cache as grade_cache
+                key = grade_cache.grade_key(grade_assignment, code_input)
+                grade = grade_cache.get_cached(key)
+                if grade is None:
+                    run_result = _run_code(code_input)
+                    grade = grade_assignment(code_input, run_result=run_result)
+                    if not run_result["timed_out"]:
+                        grade_cache.store(key, grade, assignment="grade1")
+                record_attempt(st.session_state["username"], "as1", code_input, score=grade)
                 st.write(f"**Calculated Grade:** {grade}/100")
 
                 if grade < 70:
@@ -225,33 +242,31 @@ def show():
                 else:
                     # 2. Update the database
                     try:
-                        conn = _get_conn()
-                        cur  = conn.cursor()
-                        cur.execute(
-                            "UPDATE records SET as1 = %s WHERE username = %s",
-                            (grade, st.session_state["username"]),
-                        )
-                        conn.commit()
-                        if cur.rowcount == 0:
-                            st.error("⚠️ No record updated—please check the username.")
-                        else:
-                            # 3. Optional GitHub push
-                            push_db_to_github()
-
-                            # 4. Fetch back to confirm
+                        with get_conn() as conn:
+                            cur = conn.cursor()
                             cur.execute(
-                                "SELECT as1 FROM records WHERE username = %s",
-                                (st.session_state["username"],),
+                                "UPDATE records SET as1 = %s WHERE username = %s",
+                                (grade, st.session_state["username"]),
                             )
-                            new_grade = cur.fetchone()[0]
-                            st.success(f"🎉 Submission successful! Your grade: {new_grade}/100")
-                            # reset for next time
-                            st.session_state["username_entered"] = False
-                            st.session_state["username"] = ""
+                            conn.commit()
+                            if cur.rowcount == 0:
+                                st.error("⚠️ No record updated—please check the username.")
+                            else:
+                                # 3. Optional GitHub push
+                                push_db_to_github()
+
+                                # 4. Fetch back to confirm
+                                cur.execute(
+                                    "SELECT as1 FROM records WHERE username = %s",
+                                    (st.session_state["username"],),
+                                )
+                                new_grade = cur.fetchone()[0]
+                                st.success(f"🎉 Submission successful! Your grade: {new_grade}/100")
+                                # reset for next time
+                                st.session_state["username_entered"] = False
+                                st.session_state["username"] = ""
                     except Exception as e:
                         st.error(f"Database error: {e}")
-                    finally:
-                        conn.close()
 
 if __name__ == "__main__":
     show()
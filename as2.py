@@ -1,9 +1,9 @@
 # as2.py  – MySQL edition (no local .db file)
 import streamlit as st
-import os
 from grades.grade2 import grade_assignment
-import mysql.connector
-from mysql.connector import errorcode
+from grades.cache import cached_grade
+from db_pool import get_conn
+from submissions import record_attempt
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Optional GitHub-push stub (keeps old code alive even after removal)
@@ -15,20 +15,6 @@ except ModuleNotFoundError:
         """No-op – all data now lives in MySQL."""
         return {"success": True}
 
-# ──────────────────────────────────────────────────────────────────────────────
-# MySQL connection helper
-# ──────────────────────────────────────────────────────────────────────────────
-def _get_conn():
-    cfg = st.secrets["mysql"]
-    return mysql.connector.connect(
-        host     = cfg["host"],
-        port     = int(cfg.get("port", 3306)),
-        user     = cfg["user"],
-        password = cfg["password"],
-        database = cfg["database"],
-        autocommit = False,
-    )
-
 # ──────────────────────────────────────────────────────────────────────────────
 # MAIN UI
 # ──────────────────────────────────────────────────────────────────────────────
@@ -43,16 +29,17 @@ def show():
     username = st.text_input("Enter Your Username")
     if st.button("Verify Username") and username:
         try:
-            conn = _get_conn()
-            cur  = conn.cursor()
-            cur.execute("SELECT 1 FROM records WHERE username = %s LIMIT 1", (username,))
-            if cur.fetchone():
+            with get_conn() as conn:
+                cur = conn.cursor()
+                cur.execute("SELECT 1 FROM records WHERE username = %s LIMIT 1", (username,))
+                exists = cur.fetchone() is not None
+
+            if exists:
                 st.success("Username verified. Proceed to the next steps.")
                 st.session_state["verified"] = True
             else:
                 st.error("Username not found. Please enter a registered username.")
                 st.session_state["verified"] = False
-            conn.close()
         except Exception as e:
             st.error(f"Error verifying username: {e}")
             st.session_state["verified"] = False
@@ -168,36 +155,24 @@ def show():
         # ────────────────── SUBMIT button ──────────────────
         if all_uploaded and st.button("Submit Assignment"):
             try:
-                # save uploads to a temp folder
-                temp_dir = "temp_uploads"
-                os.makedirs(temp_dir, exist_ok=True)
-                html_path = os.path.join(temp_dir, "uploaded_map.html")
-                png_path  = os.path.join(temp_dir, "uploaded_chart.png")
-                csv_path  = os.path.join(temp_dir, "uploaded_summary.csv")
-                for path, file in [
-                    (html_path, uploaded_html),
-                    (png_path,  uploaded_png),
-                    (csv_path,  uploaded_csv),
-                ]:
-                    with open(path, "wb") as f:
-                        f.write(file.getvalue())
-
-                # grade
-                grade = grade_assignment(code_input, html_path, png_path, csv_path)
+                # grade straight from the uploaded bytes (no temp files)
+                uploads = [f.getvalue() for f in (uploaded_html, uploaded_png, uploaded_csv)]
+                grade = cached_grade(grade_assignment, code_input, *uploads)
+                record_attempt(username, "as2", code_input,
+                               dict(zip(("map.html", "chart.png", "summary.csv"), uploads)), grade)
                 if grade < 70:
                     st.error(f"You got {grade}/100. Please try again.")
                     return
 
                 # store grade in MySQL
-                conn = _get_conn()
-                cur  = conn.cursor()
-                cur.execute(
-                    "UPDATE records SET as2 = %s WHERE username = %s",
-                    (grade, username),
-                )
-                conn.commit()
-                updated = cur.rowcount
-                conn.close()
+                with get_conn() as conn:
+                    cur = conn.cursor()
+                    cur.execute(
+                        "UPDATE records SET as2 = %s WHERE username = %s",
+                        (grade, username),
+                    )
+                    conn.commit()
+                    updated = cur.rowcount
 
                 if updated == 0:
                     st.error("No record updated—please check the username.")
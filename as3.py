@@ -1,9 +1,10 @@
 # as3.py  – MySQL edition (no local .db file)
 import streamlit as st
-import os
+from style_registry import inject_css
 from grades.grade3 import grade_assignment
-import mysql.connector
-from mysql.connector import errorcode
+from grades.cache import cached_grade
+from db_pool import get_conn
+from submissions import record_attempt
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Optional GitHub-push stub (keeps old call sites alive after file removal)
@@ -15,35 +16,19 @@ except ModuleNotFoundError:
         """No-op – data is already in MySQL."""
         return {"success": True}
 
-# ──────────────────────────────────────────────────────────────────────────────
-# MySQL connection helper
-# ──────────────────────────────────────────────────────────────────────────────
-def _get_conn():
-    cfg = st.secrets["mysql"]
-    return mysql.connector.connect(
-        host     = cfg["host"],
-        port     = int(cfg.get("port", 3306)),
-        user     = cfg["user"],
-        password = cfg["password"],
-        database = cfg["database"],
-        autocommit = False,
-    )
-
 # ──────────────────────────────────────────────────────────────────────────────
 # MAIN UI
 # ──────────────────────────────────────────────────────────────────────────────
+_AS3_CSS = """
+.stTextArea label, .stFileUploader label { color: white !important; }
+"""
+
+
 def show():
     st.title("Assignment 3: Data Processing and Visualization in Python")
 
     # inject widget-label CSS (unchanged)
-    st.markdown(
-        """
-        <style>
-        .stTextArea label, .stFileUploader label { color: white !important; }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    inject_css("as3", _AS3_CSS)
 
     # ─────────────────────────────────────────────
     # Step 1 – username validation
@@ -55,11 +40,10 @@ def show():
     username = st.text_input("Enter Your Username", key="as3_username_input")
     if st.button("Verify Username", key="as3_verify_button") and username:
         try:
-            conn = _get_conn()
-            cur  = conn.cursor()
-            cur.execute("SELECT 1 FROM records WHERE username = %s LIMIT 1", (username,))
-            exists = cur.fetchone() is not None
-            conn.close()
+            with get_conn() as conn:
+                cur = conn.cursor()
+                cur.execute("SELECT 1 FROM records WHERE username = %s LIMIT 1", (username,))
+                exists = cur.fetchone() is not None
 
             if exists:
                 st.success("Username verified. Proceed to the next steps.")
@@ -181,31 +165,24 @@ def show():
         # ─────────────────────────────────────────────
         if all_uploaded and st.button("Submit Assignment", key="as3_submit_button"):
             try:
-                # save uploads to a temp folder
-                temp_dir = "temp_uploads"
-                os.makedirs(temp_dir, exist_ok=True)
-                html_path  = os.path.join(temp_dir, "uploaded_map.html")
-                excel_path = os.path.join(temp_dir, "uploaded_sheet.xlsx")
-                for path, file in [(html_path, uploaded_html), (excel_path, uploaded_excel)]:
-                    with open(path, "wb") as f:
-                        f.write(file.getvalue())
-
-                # grade
-                total_grade, breakdown = grade_assignment(code_input, html_path, excel_path)
+                # grade straight from the uploaded bytes (no temp files)
+                uploads = [uploaded_html.getvalue(), uploaded_excel.getvalue()]
+                total_grade, breakdown = cached_grade(grade_assignment, code_input, *uploads)
+                record_attempt(st.session_state["username_as3"], "as3", code_input,
+                               dict(zip(("map.html", "sheet.xlsx"), uploads)), total_grade)
                 if total_grade < 70:
                     st.error(f"You got {total_grade}/100. Please try again.")
                     return
 
                 # record grade in MySQL
-                conn = _get_conn()
-                cur  = conn.cursor()
-                cur.execute(
-                    "UPDATE records SET as3 = %s WHERE username = %s",
-                    (total_grade, st.session_state["username_as3"]),
-                )
-                conn.commit()
-                updated = cur.rowcount
-                conn.close()
+                with get_conn() as conn:
+                    cur = conn.cursor()
+                    cur.execute(
+                        "UPDATE records SET as3 = %s WHERE username = %s",
+                        (total_grade, st.session_state["username_as3"]),
+                    )
+                    conn.commit()
+                    updated = cur.rowcount
 
                 if updated == 0:
                     st.error("No record updated—please check the username.")
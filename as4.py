@@ -1,10 +1,10 @@
 # as4.py  – MySQL edition (no local .db file)
 import streamlit as st
-import os
-import re
-from grades.grade4 import grade_assignment
-import mysql.connector
-from mysql.connector import errorcode
+from grades.grade4 import grade_assignment, rectangle_grade, image_grade
+from grades.cache import cached_grade
+from db_pool import get_conn
+from submissions import record_attempt
+from assets import asset_image
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Optional GitHub-push stub (keeps call-sites alive after file removal)
@@ -16,20 +16,6 @@ except ModuleNotFoundError:
         """No-op – data lives in MySQL."""
         return {"success": True}
 
-# ──────────────────────────────────────────────────────────────────────────────
-# MySQL connection helper
-# ──────────────────────────────────────────────────────────────────────────────
-def _get_conn():
-    cfg = st.secrets["mysql"]
-    return mysql.connector.connect(
-        host     = cfg["host"],
-        port     = int(cfg.get("port", 3306)),
-        user     = cfg["user"],
-        password = cfg["password"],
-        database = cfg["database"],
-        autocommit = False,
-    )
-
 # ──────────────────────────────────────────────────────────────────────────────
 # MAIN UI
 # ──────────────────────────────────────────────────────────────────────────────
@@ -43,11 +29,10 @@ def show():
     username = st.text_input("Enter Your Username", key="as4_username_input")
     if st.button("Verify Username", key="as4_verify_button") and username:
         try:
-            conn = _get_conn()
-            cur  = conn.cursor()
-            cur.execute("SELECT 1 FROM records WHERE username = %s LIMIT 1", (username,))
-            exists = cur.fetchone() is not None
-            conn.close()
+            with get_conn() as conn:
+                cur = conn.cursor()
+                cur.execute("SELECT 1 FROM records WHERE username = %s LIMIT 1", (username,))
+                exists = cur.fetchone() is not None
 
             if exists:
                 st.success("Username verified. Proceed to the next steps.")
@@ -102,7 +87,7 @@ def show():
                 - For each detected rectangle, print the top-left and bottom-right coordinates.
                 - Display the original image with the rectangles outlined for verification.
                 """, unsafe_allow_html=True)
-                st.image("correct_files/BW.jpg")
+                asset_image("correct_files/BW.jpg")
         
         with tab2:
             st.markdown("""
@@ -149,54 +134,38 @@ def show():
                     st.error("Please upload an image with rectangles outlined.")
                     return
 
-                # save uploads
-                temp_dir = "temp_uploads"
-                os.makedirs(temp_dir, exist_ok=True)
-                th_path = os.path.join(temp_dir, "as4_thresholded.png")
-                ol_path = os.path.join(temp_dir, "as4_outlined.png")
-                with open(th_path, "wb") as f:
-                    f.write(uploaded_thresholded_image.getvalue())
-                with open(ol_path, "wb") as f:
-                    f.write(uploaded_outlined_image.getvalue())
-
-                # Rectangle-coordinate grading (logic unchanged)
-                import collections
-                correct_vals = [
-                    974, 768, 1190, 890, 270, 768, 486, 889, 37, 768, 253, 890,
-                    1207, 768, 1423, 890, 740, 768, 955, 890, 505, 768, 720, 890,
-                    92, 618, 234, 660, 206, 511, 349, 554, 367, 438, 509, 480,
-                    523, 380, 665, 422, 629, 289, 772, 332, 788, 212, 930, 254,
-                    37, 136, 471, 298, 1238, 98, 1380, 141
-                ]
-                student_vals = []
-                for line in rectangle_coordinates.splitlines():
-                    student_vals += list(map(int, re.findall(r"\d+", line)))
-                rec_grade = sum(
-                    min(collections.Counter(correct_vals)[v], collections.Counter(student_vals)[v])
-                    for v in set(correct_vals)
-                )
-
-                # Simple image-existence grades
-                th_grade = 5 if uploaded_thresholded_image else 0
-                ol_grade = 5 if uploaded_outlined_image else 0
+                # Rectangle-coordinate and image-existence grades
+                rec_grade = rectangle_grade(rectangle_coordinates)
+                th_grade = image_grade(uploaded_thresholded_image)
+                ol_grade = image_grade(uploaded_outlined_image)
 
                 # Call existing grader
-                total_grade, breakdown = grade_assignment(code_input, rec_grade, th_grade, ol_grade)
+                total_grade, breakdown = cached_grade(
+                    grade_assignment, code_input, rec_grade, th_grade, ol_grade
+                )
+                record_attempt(
+                    st.session_state["username_as4"], "as4", code_input,
+                    {
+                        "coordinates.txt": rectangle_coordinates,
+                        "thresholded.png": uploaded_thresholded_image.getvalue(),
+                        "outlined.png": uploaded_outlined_image.getvalue(),
+                    },
+                    total_grade,
+                )
 
                 if total_grade < 70:
                     st.error(f"You got {total_grade}/100. Please try again.")
                     return
 
                 # store grade in MySQL
-                conn = _get_conn()
-                cur  = conn.cursor()
-                cur.execute(
-                    "UPDATE records SET as4 = %s WHERE username = %s",
-                    (total_grade, st.session_state["username_as4"]),
-                )
-                conn.commit()
-                updated = cur.rowcount
-                conn.close()
+                with get_conn() as conn:
+                    cur = conn.cursor()
+                    cur.execute(
+                        "UPDATE records SET as4 = %s WHERE username = %s",
+                        (total_grade, st.session_state["username_as4"]),
+                    )
+                    conn.commit()
+                    updated = cur.rowcount
 
                 if updated == 0:
                     st.error("No record updated—please check the username.")
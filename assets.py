@@ -0,0 +1,144 @@
+# assets.py – process-wide, content-hashed cache of static media files
+"""
+`st.image("logo.jpg")` re-reads the file from disk on every rerun of every
+page (the sidebar logo alone is ~500 KB).  This registry loads each static
+file once per process:
+
+    from assets import get_asset, asset_image
+
+    asset = get_asset("logo.jpg")        # Asset(path, data, etag, mimetype)
+    asset_image("logo.jpg", container=st.sidebar, use_container_width=True)
+
+  • `data` is immutable bytes shared by every session
+  • `etag` is a SHA-256 prefix of the content; Streamlit's media URLs are
+    content-derived too, so an unchanged asset keeps its URL and the
+    browser's cached copy is reused instead of re-downloaded
+  • a file edited on disk is reloaded (checked via mtime/size)
+  • total size is capped (ASSET_CACHE_MB, default 64); least recently used
+    files are evicted first
+  • files under `static/` that st.image would inline or re-encode (SVG,
+    WebP …) are served by Streamlit's static file server instead, at a
+    content-hashed URL (`static_url()`)
+"""
+import hashlib
+import html
+import mimetypes
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+import streamlit as st
+
+from tracing import span
+
+STATIC_DIR = "static"          # served at app/static/… (enableStaticServing)
+MAX_BYTES = int(float(os.getenv("ASSET_CACHE_MB", "64")) * 1024 * 1024)
+
+Asset = namedtuple("Asset", "path data etag mimetype")
+
+# st.image passes these through untouched when output_format matches.
+_PASSTHROUGH_FORMATS = {"image/jpeg": "JPEG", "image/png": "PNG"}
+
+
+class AssetRegistry:
+    """LRU map of path → Asset, bounded by the total size of the cached bytes."""
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()     # path → ((mtime_ns, size), Asset)
+        self._bytes = 0
+
+    def get(self, path):
+        """Return the Asset for `path`; raises OSError if it cannot be read."""
+        info = os.stat(path)
+        stamp = (info.st_mtime_ns, info.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry[0] == stamp:
+                self._entries.move_to_end(path)
+                return entry[1]
+
+        with span("asset.load", path=path) as load:
+            with open(path, "rb") as f:
+                data = f.read()
+            load.set(bytes=len(data))
+        asset = Asset(
+            path=path,
+            data=data,
+            etag=hashlib.sha256(data).hexdigest()[:16],
+            mimetype=mimetypes.guess_type(path)[0] or "application/octet-stream",
+        )
+
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old:
+                self._bytes -= len(old[1].data)
+            if len(data) <= self.max_bytes:
+                self._entries[path] = (stamp, asset)
+                self._bytes += len(data)
+                while self._bytes > self.max_bytes:
+                    _path, (_stamp, evicted) = self._entries.popitem(last=False)
+                    self._bytes -= len(evicted.data)
+        return asset
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+_registry = AssetRegistry()
+
+
+def get_asset(path):
+    """Shared-registry shortcut for `AssetRegistry.get`."""
+    return _registry.get(path)
+
+
+def _static_name(path):
+    """`path` relative to STATIC_DIR, or None when it lies outside it."""
+    rel = os.path.relpath(path, STATIC_DIR)
+    return None if rel.startswith(os.pardir) else rel.replace(os.sep, "/")
+
+
+def static_url(path):
+    """
+    Cache-busted URL of a file under STATIC_DIR, served by Streamlit's
+    static file serving (`enableStaticServing`, .streamlit/config.toml):
+    `app/static/<name>?v=<etag>`.  The file is registered (and hashed)
+    here, so an edit changes the URL and browsers may cache it forever.
+    """
+    name = _static_name(path)
+    if name is None:
+        raise ValueError(f"{path!r} is not under {STATIC_DIR}/")
+    return f"app/static/{name}?v={get_asset(path).etag}"
+
+
+def _static_img(path, container, caption=None, width=None, use_container_width=False, **_ignored):
+    style = "width:100%" if use_container_width or width is None else f"width:{int(width)}px"
+    tag = f'<img src="{html.escape(static_url(path))}" style="{style}" alt="">'
+    if caption:
+        tag = f"<figure>{tag}<figcaption>{html.escape(caption)}</figcaption></figure>"
+    container.markdown(tag, unsafe_allow_html=True)
+
+
+def asset_image(path, container=st, **kwargs):
+    """
+    `container.image()` from cached bytes instead of a disk read.  Formats
+    st.image would re-encode or inline (WebP, SVG, …) are shown as an
+    `<img>` pointing at `static_url()` when they live in STATIC_DIR, and
+    handed over by path otherwise.
+    """
+    try:
+        asset = get_asset(path)
+    except OSError:
+        container.image(path, **kwargs)          # let Streamlit report it
+        return
+    output_format = _PASSTHROUGH_FORMATS.get(asset.mimetype)
+    if output_format is not None:
+        container.image(asset.data, output_format=output_format, **kwargs)
+    elif _static_name(path) is not None:
+        _static_img(path, container, **kwargs)
+    else:
+        container.image(path, **kwargs)
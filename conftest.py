@@ -0,0 +1 @@
+# conftest.py – lets `pytest` import the app modules (grades, tracing, …) from the repo root
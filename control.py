@@ -1,21 +1,8 @@
 # control.py – Admin Control Panel for User Approvals (MySQL, keyed by username)
 import streamlit as st
-import mysql.connector
 
+from db_pool import get_conn
 
-# ──────────────────────────────────────────────────────────────────────────────
-# DB helper                                                                    │
-# ──────────────────────────────────────────────────────────────────────────────
-def _get_conn():
-    cfg = st.secrets["mysql"]
-    return mysql.connector.connect(
-        host=cfg["host"],
-        port=int(cfg.get("port", 3306)),
-        user=cfg["user"],
-        password=cfg["password"],
-        database=cfg["database"],
-        autocommit=False,
-    )
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Admin authentication                                                         │
@@ -35,70 +22,119 @@ def admin_login():
 # ──────────────────────────────────────────────────────────────────────────────
 # Data helpers                                                                 │
 # ──────────────────────────────────────────────────────────────────────────────
-def get_pending_users():
+PAGE_SIZE = 50
+
+
+@st.cache_data(ttl=120, show_spinner=False)
+def count_pending():
+    """Number of users with approved == 0."""
+    with get_conn() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM users WHERE approved = 0")
+        return cur.fetchone()[0]
+
+
+@st.cache_data(ttl=120, show_spinner=False)
+def get_pending_users(page=0, page_size=PAGE_SIZE):
     """
-    Return a list of tuples:
+    Return one page (oldest sign-ups first) as a list of tuples:
         (username, fullname, email, phone)
-    where approved == 0
+    where approved == 0.  Cached until the next approve/reject.
     """
-    conn = _get_conn()
-    cur  = conn.cursor()
-    cur.execute(
-        """
-        SELECT username, fullname, email, phone
-        FROM users
-        WHERE approved = 0
-        """
-    )
-    pending = cur.fetchall()
-    conn.close()
+    with get_conn() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT username, fullname, email, phone
+            FROM users
+            WHERE approved = 0
+            ORDER BY date_of_joining, username
+            LIMIT %s OFFSET %s
+            """,
+            (page_size, page * page_size),
+        )
+        pending = cur.fetchall()
     return pending
 
 
-def update_user_approval(username, new_status):
+def update_user_approvals(usernames, new_status):
     """
-    Set approved = new_status for the given username.
+    Set approved = new_status for every username in one transaction.
     new_status:  1  → approved
                 -1  → rejected
+    Only still-pending users are touched; returns how many were updated.
     """
-    conn = _get_conn()
-    cur  = conn.cursor()
-    cur.execute(
-        "UPDATE users SET approved = %s WHERE username = %s",
-        (new_status, username)
-    )
-    conn.commit()
-    conn.close()
+    usernames = list(usernames)
+    if not usernames:
+        return 0
+    marks = ", ".join(["%s"] * len(usernames))
+    with get_conn() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            f"UPDATE users SET approved = %s WHERE approved = 0 AND username IN ({marks})",
+            (new_status, *usernames),
+        )
+        updated = cur.rowcount
+        conn.commit()
+    count_pending.clear()
+    get_pending_users.clear()
+    return updated
+
+
+def update_user_approval(username, new_status):
+    """Single-user shortcut for `update_user_approvals`."""
+    return update_user_approvals([username], new_status)
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Admin UI                                                                     │
 # ──────────────────────────────────────────────────────────────────────────────
+def _apply_selection(new_status):
+    """Button callback: approve/reject the selected users before the rerun."""
+    selected = st.session_state.get("pending_selected", [])
+    updated = update_user_approvals(selected, new_status)
+    verb = "approved" if new_status == 1 else "rejected"
+    st.session_state["pending_flash"] = (new_status, f"{updated} user(s) {verb}.")
+    st.session_state["pending_selected"] = []
+
+
+def _select_all(usernames):
+    st.session_state["pending_selected"] = usernames
+
+
 def show_admin_panel():
     st.title("Admin Control Panel")
     st.write("Approve or Reject new user accounts")
 
-    pending_users = get_pending_users()
-    if pending_users:
-        for user in pending_users:
-            username, fullname, email, phone = user
-            st.markdown(f"**Name:** {fullname} (*{username}*)")
-            st.markdown(f"**Email:** {email}")
-            st.markdown(f"**Phone:** {phone}")
-
-            col1, col2 = st.columns(2)
-            with col1:
-                if st.button("Approve", key=f"approve_{username}"):
-                    update_user_approval(username, 1)
-                    st.success(f"User {username} has been approved.")
-                    st.experimental_rerun()
-            with col2:
-                if st.button("Reject", key=f"reject_{username}"):
-                    update_user_approval(username, -1)
-                    st.error(f"User {username} has been rejected.")
-                    st.experimental_rerun()
-            st.markdown("---")
-    else:
+    flash = st.session_state.pop("pending_flash", None)
+    if flash:
+        (st.success if flash[0] == 1 else st.error)(flash[1])
+
+    total = count_pending()
+    if not total:
         st.info("No pending users for approval.")
+        return
+
+    pages = -(-total // PAGE_SIZE)
+    page = st.number_input(f"Page (of {pages}) – {total} pending", min_value=1,
+                           max_value=pages, value=1, step=1) - 1
+    pending_users = get_pending_users(int(page))
+    st.dataframe(
+        [{"Username": u, "Name": n, "Email": e, "Phone": p} for u, n, e, p in pending_users],
+        use_container_width=True,
+    )
+
+    labels = {u: f"{n} ({u})" for u, n, _e, _p in pending_users}
+    # Drop selections from another page (or already handled elsewhere).
+    st.session_state["pending_selected"] = [
+        u for u in st.session_state.get("pending_selected", []) if u in labels
+    ]
+    st.button("Select everyone on this page", on_click=_select_all, args=(list(labels),))
+    st.multiselect("Selected users", options=list(labels), format_func=labels.get,
+                   key="pending_selected")
+
+    col1, col2 = st.columns(2)
+    col1.button("Approve selected", on_click=_apply_selection, args=(1,), type="primary")
+    col2.button("Reject selected", on_click=_apply_selection, args=(-1,))
 
 # ──────────────────────────────────────────────────────────────────────────────
 def main():
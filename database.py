@@ -2,92 +2,53 @@
 """
 Database helpers for a Streamlit app backed by MySQL.
 
-🔄 2025-06-19 performance update
--------------------------------
-Single change:
-    • `create_tables()` is now wrapped in `@st.cache_resource`, so
-      table creation happens only once per session.  Subsequent calls
-      return instantly, eliminating repeated connection overhead.
+The schema is owned by the versioned migrations in `migrations.py`, which
+run out-of-band (deploy step / by hand):
+
+    python migrations.py
+
+Requests no longer issue any DDL.  `check_schema()` runs once per
+process (`@st.cache_resource`) and costs a single
+`SELECT MAX(version) FROM schema_migrations`; a database that is behind
+is logged, and – only with AUTO_MIGRATE=1, handy for a fresh local
+database – migrated on the spot.
+
+Connections come from the shared pool in `db_pool.py`.
 """
+import logging
+import os
 
 import streamlit as st
 import mysql.connector
-from mysql.connector import errorcode
-
 
-# ---------------------------------------------------------------------------
-# Connection helper
-# ---------------------------------------------------------------------------
+from db_pool import get_conn
+from migrations import LATEST_VERSION, migrate, schema_version
 
-def _get_conn() -> mysql.connector.MySQLConnection:
-    """Return a fresh MySQL connection from Streamlit secrets."""
-    cfg = st.secrets["mysql"]
-    return mysql.connector.connect(
-        host=cfg["host"],
-        port=int(cfg.get("port", 3306)),
-        user=cfg["user"],
-        password=cfg["password"],
-        database=cfg["database"],
-        autocommit=False,
-        connection_timeout=10,
-        charset="utf8mb4",
-        use_unicode=True,
-    )
+AUTO_MIGRATE = os.getenv("AUTO_MIGRATE", "0") == "1"
 
 
 # ---------------------------------------------------------------------------
-# Schema creation — now cached
+# Schema check — once per process
 # ---------------------------------------------------------------------------
 
 @st.cache_resource(show_spinner=False)
-def create_tables() -> bool:
+def check_schema() -> bool:
     """
-    Ensure all required tables exist.
-
-    Thanks to @st.cache_resource, this body executes only once per
-    Streamlit session.  Later calls return the cached `True` immediately.
+    True when the database is at the latest migration.  Executes once per
+    process; later calls return the cached result immediately.
     """
-    ddl_statements = [
-        # USERS
-        """
-        CREATE TABLE IF NOT EXISTS users (
-            fullname         VARCHAR(100),
-            email            VARCHAR(100),
-            phone            BIGINT,
-            username         VARCHAR(50)  PRIMARY KEY,
-            password         VARCHAR(100),
-            date_of_joining  TIMESTAMP     NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            approved         TINYINT       DEFAULT 0
-        ) ENGINE=InnoDB
-        """,
-        # RECORDS
-        """
-        CREATE TABLE IF NOT EXISTS records (
-            username VARCHAR(50) PRIMARY KEY,
-            as1      INT DEFAULT NULL,
-            as2      INT DEFAULT NULL,
-            as3      INT DEFAULT NULL,
-            as4      INT DEFAULT NULL
-        ) ENGINE=InnoDB
-        """,
-        # …add further CREATE TABLE statements here…
-    ]
-
-    conn = cur = None
     try:
-        conn = _get_conn()
-        cur = conn.cursor()
-        for stmt in ddl_statements:
-            cur.execute(stmt)
-        conn.commit()
-        return True          # value cached by Streamlit
-    except mysql.connector.Error as e:
-        # Ignore “table already exists”; surface everything else
-        if e.errno not in (errorcode.ER_TABLE_EXISTS_ERROR,):
-            st.warning(f"Error creating tables: {e.msg}")
-        return False
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
+        with get_conn() as conn:
+            version = schema_version(conn.cursor())
+        if version >= LATEST_VERSION:
+            return True
+        if AUTO_MIGRATE:
+            migrate(log=logging.info)
+            return True
+        logging.warning(
+            "Database schema at version %s, code expects %s – run `python migrations.py`.",
+            version, LATEST_VERSION,
+        )
+    except (mysql.connector.Error, RuntimeError) as e:
+        logging.warning("Schema check failed: %s", getattr(e, "msg", e))
+    return False
@@ -0,0 +1,245 @@
+# db_pool.py – process-wide MySQL connection pool shared by every page
+"""
+One connection pool per Streamlit process, replacing the per-module
+`_get_conn()` helpers that opened a fresh TCP + auth handshake per query.
+
+Usage
+-----
+    from db_pool import get_conn
+
+    with get_conn() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT 1")
+        conn.commit()            # commit explicitly, as before
+
+Leaving the `with` block hands the connection back to the pool; any
+uncommitted transaction is rolled back first.  Never call `conn.close()`
+on a pooled connection.
+
+Tuning (all optional, in the `[mysql]` block of secrets.toml)
+-------------------------------------------------------------
+    pool_size        max open connections per process      (default 8)
+    pool_timeout     seconds to wait for a free connection  (default 10)
+    pool_recycle     reconnect connections older than this  (default 1800)
+    pool_ping_after  ping a connection idle longer than this (default 30)
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import streamlit as st
+import mysql.connector
+from mysql.connector import errors
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Defaults                                                                     │
+# ──────────────────────────────────────────────────────────────────────────────
+_POOL_DEFAULTS = {
+    "pool_size": 8,
+    "pool_timeout": 10,
+    "pool_recycle": 1800,
+    "pool_ping_after": 30,
+}
+
+
+class PoolTimeout(errors.PoolError):
+    """Raised when no connection frees up within `pool_timeout` seconds."""
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Pool                                                                         │
+# ──────────────────────────────────────────────────────────────────────────────
+class ConnectionPool:
+    """
+    Small thread-safe LIFO pool of `mysql.connector` connections.
+
+    • size        – hard cap on open connections (checked out + idle)
+    • health check – connections idle for more than `ping_after` seconds
+                     are pinged before reuse and replaced if dead
+    • recycling    – connections older than `recycle` seconds are closed
+                     and reopened, staying clear of MySQL's wait_timeout
+    """
+
+    def __init__(self, connect_kwargs, size=8, timeout=10, recycle=1800, ping_after=30):
+        self._connect_kwargs = dict(connect_kwargs)
+        self.size = int(size)
+        self.timeout = float(timeout)
+        self.recycle = float(recycle)
+        self.ping_after = float(ping_after)
+
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._idle = []            # [(conn, created_at, last_used), ...]
+        self._born = {}            # id(conn) → created_at for checked-out conns
+
+    # ── internals ────────────────────────────────────────────────────────────
+    def _open(self):
+        conn = mysql.connector.connect(**self._connect_kwargs)
+        self._born[id(conn)] = time.monotonic()
+        return conn
+
+    @staticmethod
+    def _discard(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _checkout_idle(self):
+        """Pop a healthy idle connection, or return None if none is left."""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                conn, created, last_used = self._idle.pop()
+
+            now = time.monotonic()
+            if now - created > self.recycle:
+                self._discard(conn)
+                continue
+            if now - last_used > self.ping_after:
+                try:
+                    conn.ping(reconnect=False)
+                except errors.Error:
+                    self._discard(conn)
+                    continue
+            self._born[id(conn)] = created
+            return conn
+
+    # ── public API ───────────────────────────────────────────────────────────
+    def acquire(self):
+        """Check out a connection, blocking up to `timeout` seconds."""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeout(
+                msg=f"No free MySQL connection after {self.timeout:.0f}s "
+                    f"(pool_size={self.size})"
+            )
+        try:
+            return self._checkout_idle() or self._open()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn):
+        """Return a connection; rolls back leftovers, drops broken ones."""
+        created = self._born.pop(id(conn), time.monotonic())
+        try:
+            # Drain half-read SELECTs and end the implicit InnoDB transaction
+            # so the next borrower neither trips "Unread result found" nor
+            # reads from a stale REPEATABLE READ snapshot.
+            conn.consume_results()
+            if conn.in_transaction:
+                conn.rollback()
+            healthy = True
+        except errors.Error:
+            healthy = False
+
+        if healthy:
+            with self._lock:
+                self._idle.append((conn, created, time.monotonic()))
+        else:
+            self._discard(conn)
+        self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close_all(self):
+        """Close every idle connection (checked-out ones close on release)."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _created, _last in idle:
+            self._discard(conn)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Process-wide singleton                                                       │
+# ──────────────────────────────────────────────────────────────────────────────
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _build_pool(cfg):
+    opts = {k: cfg.get(k, v) for k, v in _POOL_DEFAULTS.items()}
+    connect_kwargs = dict(
+        host=cfg["host"],
+        port=int(cfg.get("port", 3306)),
+        user=cfg["user"],
+        password=cfg["password"],
+        database=cfg["database"],
+        autocommit=False,
+        connection_timeout=10,
+        charset="utf8mb4",
+        use_unicode=True,
+    )
+    return ConnectionPool(
+        connect_kwargs,
+        size=opts["pool_size"],
+        timeout=opts["pool_timeout"],
+        recycle=opts["pool_recycle"],
+        ping_after=opts["pool_ping_after"],
+    )
+
+
+def configure_pool(cfg):
+    """
+    Build the shared pool from an explicit `[mysql]`-style mapping instead
+    of `st.secrets` – for command-line tools such as `regrade.py` that run
+    outside Streamlit.  Replaces (and closes) any existing pool.
+    """
+    global _pool
+    with _pool_lock:
+        old, _pool = _pool, _build_pool(cfg)
+    if old is not None:
+        old.close_all()
+    return _pool
+
+
+def add_db_arguments(parser):
+    """--host/--port/--user/--password/--database for command-line tools."""
+    parser.add_argument("--host")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--user")
+    parser.add_argument("--password")
+    parser.add_argument("--database")
+
+
+def configure_from_args(args, pool_size=2):
+    """
+    Point the pool at the CLI flags, else the MYSQL_HOST … MYSQL_DATABASE
+    environment variables; with neither, `[mysql]` secrets are used as usual.
+    """
+    host = args.host or os.getenv("MYSQL_HOST")
+    if not host:
+        return None
+    return configure_pool({
+        "host": host,
+        "port": args.port or os.getenv("MYSQL_PORT", 3306),
+        "user": args.user or os.getenv("MYSQL_USER", "root"),
+        "password": args.password if args.password is not None else os.getenv("MYSQL_PASSWORD", ""),
+        "database": args.database or os.getenv("MYSQL_DATABASE"),
+        "pool_size": pool_size,
+    })
+
+
+def get_pool():
+    """Return the shared pool, building it from `[mysql]` secrets on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = _build_pool(st.secrets["mysql"])
+    return _pool
+
+
+def get_conn():
+    """Context manager yielding a pooled connection (see module docstring)."""
+    return get_pool().connection()
@@ -0,0 +1,201 @@
+# exports.py – streaming CSV / XLSX exports of the course tables
+"""
+The admin CSV used to be `df.to_csv()` over a DataFrame holding the whole
+table, so memory grew with every participant and nothing was written
+until the last row was in.  Exports now stream:
+
+    from exports import EXPORTS, write_export
+
+    with open("grades.xlsx", "wb") as f:
+        write_export("grades", "xlsx", f)
+
+  • rows come from an unbuffered (server-side) cursor, `BATCH_SIZE` at a
+    time – the result set is never materialized on the client
+  • CSV rows are written as they arrive; XLSX uses openpyxl's write-only
+    workbook, which serializes each row immediately
+  • memory stays flat at one batch, whatever the table size
+
+Available exports (`EXPORTS`): users (no passwords), progress (with
+total_tabs / percent_complete from the leaderboard, ranked over everyone),
+records, and grades – every user joined with their assignment and quiz
+scores (total = assignments).
+
+Large exports do not need Streamlit at all:
+
+    python exports.py grades --format xlsx -o grades.xlsx
+    python exports.py progress --search an > progress.csv
+
+(database flags as for regrade.py: --host/--user/… or MYSQL_* variables,
+else `.streamlit/secrets.toml`).
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+import tempfile
+from collections import namedtuple
+
+from db_pool import add_db_arguments, configure_from_args, get_conn
+from github_progress import percent_sql, total_sql
+
+BATCH_SIZE = 1000
+EXPORT_DIR = os.path.join(".cache", "exports")
+
+Export = namedtuple("Export", "sql search order")
+
+# name → Export(SELECT … FROM …, prefix-searchable columns, ORDER BY)
+EXPORTS = {
+    "users": Export(
+        """SELECT u.username, u.fullname, u.email, u.phone,
+                  u.date_of_joining, u.approved
+           FROM users AS u""",
+        ("u.username", "u.fullname"),
+        "u.username",
+    ),
+    "progress": Export(
+        f"""SELECT p.username, p.fullname,
+                   p.week1track, p.week2track, p.week3track, p.week4track, p.week5track,
+                   t.total_tabs, t.percent_complete, t.rank_pos AS `rank`
+            FROM progress AS p
+            JOIN (SELECT p.username, {total_sql('s')} AS total_tabs,
+                         {percent_sql('s')} AS percent_complete,
+                         RANK() OVER (ORDER BY {total_sql('s')} DESC) AS rank_pos
+                  FROM progress AS p
+                  LEFT JOIN progress_summary AS s ON s.username = p.username
+                 ) AS t ON t.username = p.username""",
+        ("p.username", "p.fullname"),
+        "p.fullname, p.username",
+    ),
+    "records": Export(
+        """SELECT r.username, r.as1, r.as2, r.as3, r.as4, r.quiz1, r.quiz2
+           FROM records AS r""",
+        ("r.username",),
+        "r.username",
+    ),
+    "grades": Export(
+        """SELECT u.username, u.fullname, u.email,
+                  r.as1, r.as2, r.as3, r.as4, r.quiz1, r.quiz2,
+                  (COALESCE(r.as1, 0) + COALESCE(r.as2, 0) +
+                   COALESCE(r.as3, 0) + COALESCE(r.as4, 0)) AS total
+           FROM users AS u
+           LEFT JOIN records AS r ON r.username = u.username""",
+        ("u.username", "u.fullname"),
+        "u.username",
+    ),
+}
+
+FORMATS = {
+    "csv": ("text/csv", ".csv"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", ".xlsx"),
+}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Row source                                                                   │
+# ──────────────────────────────────────────────────────────────────────────────
+def _query(name, search):
+    spec = EXPORTS[name]
+    sql, params = spec.sql, []
+    if search:
+        like = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        sql += " WHERE (" + " OR ".join(f"{col} LIKE %s" for col in spec.search) + ")"
+        params = [like] * len(spec.search)
+    return f"{sql} ORDER BY {spec.order}", params
+
+
+def iter_rows(name, search="", batch_size=BATCH_SIZE):
+    """
+    Yield the column names, then every row of export `name` – fetched
+    `batch_size` at a time through an unbuffered cursor.  Stopping early
+    is fine: the pool drains the rest when the connection is released.
+    """
+    sql, params = _query(name, search)
+    with get_conn() as conn:
+        cur = conn.cursor(buffered=False)
+        cur.execute(sql, params)
+        yield [d[0] for d in cur.description]
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Writers                                                                      │
+# ──────────────────────────────────────────────────────────────────────────────
+def write_csv(rows, fileobj):
+    """Write `rows` (header first) as UTF-8 CSV to a binary file object."""
+    text = io.TextIOWrapper(fileobj, encoding="utf-8", newline="", write_through=True)
+    try:
+        csv.writer(text).writerows(rows)
+    finally:
+        text.detach()              # leave `fileobj` open for the caller
+
+
+def write_xlsx(rows, fileobj, title="export"):
+    """Write `rows` (header first) with openpyxl's write-only workbook."""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=title[:31])
+    for row in rows:
+        ws.append(list(row))
+    wb.save(fileobj)
+
+
+def write_export(name, fmt, fileobj, search=""):
+    """Stream export `name` in format `fmt` ("csv" / "xlsx") into `fileobj`."""
+    rows = iter_rows(name, search)
+    if fmt == "csv":
+        write_csv(rows, fileobj)
+    elif fmt == "xlsx":
+        write_xlsx(rows, fileobj, title=name)
+    else:
+        raise ValueError(f"unknown export format {fmt!r}")
+
+
+def export_file(name, fmt, search=""):
+    """
+    Write the export to a temporary file under EXPORT_DIR and return it,
+    rewound and open for reading – hand it straight to `st.download_button`.
+    The file is deleted when closed.
+    """
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    f = tempfile.NamedTemporaryFile(prefix=f"{name}-", suffix=FORMATS[fmt][1], dir=EXPORT_DIR)
+    try:
+        write_export(name, fmt, f, search)
+        f.seek(0)
+    except Exception:
+        f.close()
+        raise
+    return f
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Command line                                                                 │
+# ──────────────────────────────────────────────────────────────────────────────
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description="Export a course table as CSV or XLSX.")
+    parser.add_argument("export", choices=sorted(EXPORTS))
+    parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+    parser.add_argument("--search", default="", help="username / name prefix filter")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    add_db_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    configure_from_args(args, pool_size=1)
+    if args.output:
+        with open(args.output, "wb") as f:
+            write_export(args.export, args.format, f, args.search)
+    else:
+        write_export(args.export, args.format, sys.stdout.buffer, args.search)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,74 @@
 # github_progress.py  – now backed by MySQL, no GitHub token needed
-import streamlit as st
-import mysql.connector
-from mysql.connector import IntegrityError
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from mysql.connector import errorcode, errors
+
+from db_pool import get_conn
 
 
 # ──────────────────────────────────────────────────────────────────────────────
-# DB helper                                                                    │
+# Process-wide progress cache (TTL + LRU)                                      │
 # ──────────────────────────────────────────────────────────────────────────────
-def _get_conn():
-    cfg = st.secrets["mysql"]
-    return mysql.connector.connect(
-        host=cfg["host"],
-        port=int(cfg.get("port", 3306)),
-        user=cfg["user"],
-        password=cfg["password"],
-        database=cfg["database"],
-        autocommit=False,
-    )
+class _ProgressCache:
+    """
+    username → {"week1": int, …, "week5": int}, shared by every session in
+    the process.  Gating checks and week pages read from here; writes go
+    through `update_user_progress()`, which updates the entry in place.
+    Entries expire after `ttl` seconds so out-of-band edits (admin fixes,
+    manual SQL) still show up eventually.
+    """
+
+    def __init__(self, ttl=300, max_entries=4096):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data = OrderedDict()   # username → (expires_at, progress dict)
+        self._lock = threading.Lock()
+
+    def get(self, username):
+        with self._lock:
+            hit = self._data.get(username)
+            if hit is None:
+                return None
+            expires_at, progress = hit
+            if expires_at < time.monotonic():
+                del self._data[username]
+                return None
+            self._data.move_to_end(username)
+            return dict(progress)
+
+    def put(self, username, progress):
+        with self._lock:
+            self._data[username] = (time.monotonic() + self.ttl, dict(progress))
+            self._data.move_to_end(username)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def advance(self, username, week_key, value):
+        """Raise a cached week counter to `value` (never lowers it)."""
+        with self._lock:
+            hit = self._data.get(username)
+            if hit is not None:
+                expires_at, progress = hit
+                if value > progress.get(week_key, 0):
+                    progress[week_key] = value
+
+    def invalidate(self, username=None):
+        with self._lock:
+            if username is None:
+                self._data.clear()
+            else:
+                self._data.pop(username, None)
+
+
+_progress_cache = _ProgressCache()
+
+
+def invalidate_progress_cache(username=None):
+    """Drop one user's cached progress (or everyone's when `username` is None)."""
+    _progress_cache.invalidate(username)
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -33,93 +85,214 @@ def save_github_progress(progress_data, contents):
 
 
 # ──────────────────────────────────────────────────────────────────────────────
-# Core API (same signatures as before)                                         │
+# Atomic upsert                                                                │
 # ──────────────────────────────────────────────────────────────────────────────
-def get_user_progress(username):
+# week → number of lesson tabs in modules_week1 … modules_week5 (the highest
+# value a week counter can reach).  Single source for every progress view.
+WEEK_TABS = {1: 11, 2: 12, 3: 12, 4: 7, 5: 4}
+TOTAL_TABS = sum(WEEK_TABS.values())
+
+_WEEK_COLUMNS = ("week1track", "week2track", "week3track", "week4track", "week5track")
+_DEFAULT_ROW  = {"week1track": 1, "week2track": 0, "week3track": 0, "week4track": 0, "week5track": 0}
+
+
+def upsert_progress(cur, username, week=None, tab_index=0):
     """
-    Returns a dict like
-      { "week1": int, "week2": int, ..., "week5": int }
-    creating a fresh row with defaults if the user isn't present.
+    "Create if missing, advance only if greater" in one statement.
+
+    With `week` (1-5) the row's week counter becomes
+    GREATEST(current, tab_index); without it the row is only created
+    (week1 unlocked, others 0) when absent.  Never raises IntegrityError,
+    so concurrent double-clicks cannot race.  The caller commits.
+
+    Returns the MySQL affected-row count:
+        1 → row created, 2 → counter advanced, 0 → nothing changed.
     """
-    conn = _get_conn()
-    cur  = conn.cursor(dictionary=True)
+    values = dict(_DEFAULT_ROW)
+    if week is None:
+        on_duplicate, extra = "username = username", ()
+    else:
+        if week not in range(1, 6):
+            raise ValueError(f"week must be 1-5, got {week!r}")
+        column = f"week{week}track"
+        values[column] = max(values[column], tab_index)
+        on_duplicate, extra = f"{column} = GREATEST({column}, %s)", (tab_index,)
 
     cur.execute(
-        """
-        SELECT week1track, week2track, week3track, week4track, week5track
-        FROM progress
-        WHERE username = %s
+        f"""
+        INSERT INTO progress
+            (username, fullname, {", ".join(_WEEK_COLUMNS)})
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE {on_duplicate}
         """,
-        (username,),
+        (username, username, *values.values(), *extra),   # fullname fallback = username
     )
-    row = cur.fetchone()
+    return cur.rowcount
+
 
-    if row is None:
-        # Insert a new progress row with week1 unlocked (1) and others 0
+# ──────────────────────────────────────────────────────────────────────────────
+# Leaderboard (materialized in `progress_summary`)                            │
+# ──────────────────────────────────────────────────────────────────────────────
+_TOTAL_SQL = " + ".join(f"COALESCE(p.{c}, 0)" for c in _WEEK_COLUMNS)
+_PERCENT_SQL = f"LEAST(100, ROUND(({_TOTAL_SQL}) / {TOTAL_TABS} * 100, 1))"
+
+
+def total_sql(summary="s"):
+    """
+    total_tabs of leaderboard row `summary`, computed from the progress
+    row `p` when the leaderboard row is missing (a refresh that failed).
+    Readers must LEFT JOIN progress_summary onto `progress AS p`.
+    """
+    return f"COALESCE({summary}.total_tabs, {_TOTAL_SQL})"
+
+
+def percent_sql(summary="s"):
+    """percent_complete counterpart of `total_sql`."""
+    return f"COALESCE({summary}.percent_complete, {_PERCENT_SQL})"
+
+
+_SUMMARY_RETRIES = 3
+_RETRY_ERRNOS = (errorcode.ER_LOCK_DEADLOCK, errorcode.ER_LOCK_WAIT_TIMEOUT)
+
+
+def refresh_summary(conn, username):
+    """
+    Bring `username`'s leaderboard row in line with their progress row:
+    one INSERT … SELECT … ON DUPLICATE KEY UPDATE touching only that row.
+    Call it *after* the progress write has been committed – it runs as
+    its own short transaction, retried on deadlock (1213) / lock wait
+    timeout.  Ranks are not stored; readers compute them from
+    `idx_summary_total` (see `rank_sql`).  A failure is logged and never
+    undoes the progress write or reaches the page: readers fall back to
+    the progress row while the leaderboard row is missing (`total_sql`),
+    and the next progress change refreshes it.
+    """
+    for attempt in range(1, _SUMMARY_RETRIES + 1):
         try:
+            cur = conn.cursor()
             cur.execute(
-                """
-                INSERT INTO progress
-                    (username, fullname, week1track, week2track, week3track, week4track, week5track)
-                VALUES (%s, %s, 1, 0, 0, 0, 0)
-                """,
-                (username, username),   # fullname fallback = username
-            )
-            conn.commit()
-            row = {
-                "week1track": 1,
-                "week2track": 0,
-                "week3track": 0,
-                "week4track": 0,
-                "week5track": 0,
-            }
-        except IntegrityError:
-            conn.rollback()
-            # retry select in rare race condition
-            cur.execute(
-                """
-                SELECT week1track, week2track, week3track, week4track, week5track
-                FROM progress
-                WHERE username = %s
+                f"""
+                INSERT INTO progress_summary (username, fullname, total_tabs, percent_complete)
+                SELECT p.username, COALESCE(u.fullname, p.username), {_TOTAL_SQL}, {_PERCENT_SQL}
+                FROM progress AS p LEFT JOIN users AS u ON u.username = p.username
+                WHERE p.username = %s
+                ON DUPLICATE KEY UPDATE fullname = VALUES(fullname),
+                                        total_tabs = VALUES(total_tabs),
+                                        percent_complete = VALUES(percent_complete)
                 """,
                 (username,),
             )
-            row = cur.fetchone()
+            conn.commit()
+            return True
+        except errors.Error as e:
+            try:
+                conn.rollback()
+            except errors.Error:
+                pass                     # broken connection; the pool replaces it
+            if e.errno not in _RETRY_ERRNOS or attempt == _SUMMARY_RETRIES:
+                logging.warning("Leaderboard refresh for %s failed: %s", username, e)
+                return False
+            time.sleep(0.05 * attempt)
+
+
+def rank_sql(alias="s"):
+    """
+    Competition rank (ties share a rank) of the row's `total_sql(alias)`,
+    as a correlated COUNT over `idx_summary_total` – meant for a page of
+    rows; use RANK() OVER (ORDER BY total_tabs DESC) for whole-table reads.
+    """
+    return (f"(1 + (SELECT COUNT(*) FROM progress_summary AS r "
+            f"WHERE r.total_tabs > {total_sql(alias)}))")
+
+
+def rebuild_leaderboard():
+    """
+    Recompute `progress_summary` from scratch.  For bootstrapping and
+    after out-of-band edits to `progress`.
+    """
+    with get_conn() as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM progress_summary")
+        cur.execute(
+            f"""
+            INSERT INTO progress_summary (username, fullname, total_tabs, percent_complete)
+            SELECT p.username, COALESCE(u.fullname, p.username), {_TOTAL_SQL}, {_PERCENT_SQL}
+            FROM progress AS p LEFT JOIN users AS u ON u.username = p.username
+            """
+        )
+        conn.commit()
+        return cur.rowcount
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Core API (same signatures as before)                                         │
+# ──────────────────────────────────────────────────────────────────────────────
+def get_user_progress(username):
+    """
+    Returns a dict like
+      { "week1": int, "week2": int, ..., "week5": int }
+    creating a fresh row with defaults if the user isn't present.
+    Served from the process cache when possible.
+    """
+    cached = _progress_cache.get(username)
+    if cached is not None:
+        return cached
 
-    conn.close()
+    with get_conn() as conn:
+        cur = conn.cursor(dictionary=True)
+
+        cur.execute(
+            """
+            SELECT week1track, week2track, week3track, week4track, week5track
+            FROM progress
+            WHERE username = %s
+            """,
+            (username,),
+        )
+        row = cur.fetchone()
+
+        if row is None:
+            # Create the row (week1 unlocked) – a no-op if another request won
+            created = upsert_progress(cur, username)
+            conn.commit()
+            if created:
+                refresh_summary(conn, username)
+                row = dict(_DEFAULT_ROW)
+            else:
+                cur.execute(
+                    """
+                    SELECT week1track, week2track, week3track, week4track, week5track
+                    FROM progress
+                    WHERE username = %s
+                    """,
+                    (username,),
+                )
+                row = cur.fetchone()
 
     # Map DB column names → original keys expected by calling code
-    return {
+    progress = {
         "week1": row["week1track"],
         "week2": row["week2track"],
         "week3": row["week3track"],
         "week4": row["week4track"],
         "week5": row["week5track"],
     }
+    _progress_cache.put(username, progress)
+    return dict(progress)
 
 
 def update_user_progress(username, week, new_tab_index):
     """
-    Update progress if new_tab_index is greater than the stored value.
-    `week` is 1-5.
+    Update progress if new_tab_index is greater than the stored value,
+    creating the row if needed, in a single round trip.
+    `week` is 1-5.  The cached copy and, once the progress write is
+    committed, the user's leaderboard row are updated write-through.
     """
-    column = f"week{week}track"
-    conn   = _get_conn()
-    cur    = conn.cursor()
-
-    # Check current value first
-    cur.execute(
-        f"SELECT {column} FROM progress WHERE username = %s",
-        (username,),
-    )
-    row = cur.fetchone()
-    current = row[0] if row else 0
-
-    if new_tab_index > current:
-        cur.execute(
-            f"UPDATE progress SET {column} = %s WHERE username = %s",
-            (new_tab_index, username),
-        )
+    with get_conn() as conn:
+        cur = conn.cursor()
+        changed = upsert_progress(cur, username, week, new_tab_index)
         conn.commit()
+        if changed:
+            refresh_summary(conn, username)
 
-    conn.close()
+    _progress_cache.advance(username, f"week{week}", new_tab_index)
@@ -0,0 +1,243 @@
+# grades/analysis.py – one-pass static feature index for the code-quality rubrics
+"""
+The rubrics used to answer "does the student import pandas?", "are there
+comments?", "is the spacing right?" with substring checks and regexes over
+the raw text, one scan per criterion.  Those misfire on long submissions:
+"x" matches `max`, "#" matches a URL fragment, `\\S=\\S` matches every
+`key=value` in a query string.
+
+`analyze(code)` parses the code once – `ast` for structure, `tokenize`
+for comments, spacing and blank lines – into a `CodeFeatures` index:
+
+    f = analyze(code)
+    f.imports_module("folium")      # import folium / from folium.x import y
+    f.called("folium.Marker")       # folium.Marker(...), also via aliases
+    f.call_count("folium.Marker")
+    "popup" in f.keywords           # keyword arguments used in calls
+    f.assigned_names, f.single_letter_names, f.function_defs
+    f.comment_count, f.blank_lines, f.spacing_issues
+
+Code that does not parse is indexed with line-based regex fallbacks
+(`f.parsed` is False), so a syntax error costs the points it should and
+no more.  Results are memoized per source string.
+"""
+import ast
+import io
+import keyword
+import re
+import tokenize
+from collections import Counter
+from functools import lru_cache
+
+from tracing import span
+
+# Operators that should have a space on both sides (PEP 8, simplified).
+_SPACED_OPS = {
+    "=", "==", "!=", "<", ">", "<=", ">=", "+", "-", "*", "/", "//", "%",
+    "+=", "-=", "*=", "/=", "//=", "%=", "**=", ":=",
+}
+_OPENERS, _CLOSERS = "([{", ")]}"
+
+
+class CodeFeatures:
+    """Read-only feature index of one submission (build it with `analyze`)."""
+
+    def __init__(self, code):
+        self.parsed = True
+        self.imports = set()            # full dotted module names
+        self.imported_names = set()     # names bound by import statements
+        self.aliases = {}               # local name → qualified name
+        self.assigned_names = set()     # assignment / with-as / def targets
+        self.loop_names = set()         # for-loop and comprehension targets
+        self.function_defs = set()
+        self.calls = Counter()          # qualified callee → number of call sites
+        self.keywords = set()           # keyword-argument names
+        self.strings = []               # string constants
+        self.comment_count = 0
+        self.blank_lines = 0
+        self.code_blocks = 0            # runs of code separated by blank lines
+        self.spacing_issues = 0
+
+        try:
+            tree = ast.parse(code)
+        except (SyntaxError, ValueError):
+            self.parsed = False
+            self._index_lines(code)
+        else:
+            self._index_tree(tree)
+        try:
+            self._index_tokens(code)
+        except (tokenize.TokenError, IndentationError, SyntaxError):
+            self._index_layout(code)
+
+        self.single_letter_names = {n for n in self.assigned_names if len(n) == 1 and n != "_"}
+
+    # ── queries ──────────────────────────────────────────────────────────────
+    def imports_module(self, name):
+        """True if `name` or one of its submodules is imported."""
+        return any(m == name or m.startswith(name + ".") for m in self.imports)
+
+    def call_count(self, name):
+        """Call sites whose callee is `name` or ends in ".name"."""
+        return sum(n for callee, n in self.calls.items()
+                   if callee == name or callee.endswith("." + name))
+
+    def called(self, name):
+        return self.call_count(name) > 0
+
+    # ── ast pass ─────────────────────────────────────────────────────────────
+    def _qualify(self, node):
+        """Dotted name of a Name/Attribute chain, with import aliases resolved."""
+        parts = []
+        while isinstance(node, ast.Attribute):
+            parts.append(node.attr)
+            node = node.value
+        if not isinstance(node, ast.Name):
+            return None
+        parts.append(self.aliases.get(node.id, node.id))
+        return ".".join(reversed(parts))
+
+    @classmethod
+    def _target_names(cls, target):
+        """Names bound by `target`: `a, *b = …` yes; `d[k] = …`, `obj.x = …` no."""
+        if isinstance(target, ast.Name):
+            return {target.id} if isinstance(target.ctx, ast.Store) else set()
+        if isinstance(target, ast.Starred):
+            return cls._target_names(target.value)
+        if isinstance(target, (ast.Tuple, ast.List)):
+            return set().union(*(cls._target_names(e) for e in target.elts))
+        return set()
+
+    def _index_tree(self, tree):
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    self.imports.add(alias.name)
+                    local = alias.asname or alias.name.split(".")[0]
+                    self.imported_names.add(local)
+                    self.aliases[local] = alias.name if alias.asname else local
+            elif isinstance(node, ast.ImportFrom):
+                module = node.module or ""
+                self.imports.add(module)
+                for alias in node.names:
+                    local = alias.asname or alias.name
+                    self.imported_names.add(local)
+                    self.aliases[local] = f"{module}.{alias.name}" if module else alias.name
+            elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                for target in targets:
+                    self.assigned_names |= self._target_names(target)
+            elif isinstance(node, ast.NamedExpr):
+                self.assigned_names.add(node.target.id)
+            elif isinstance(node, ast.withitem) and node.optional_vars is not None:
+                self.assigned_names |= self._target_names(node.optional_vars)
+            elif isinstance(node, (ast.For, ast.AsyncFor, ast.comprehension)):
+                self.loop_names |= self._target_names(node.target)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self.function_defs.add(node.name)
+            elif isinstance(node, ast.Call):
+                self.keywords.update(k.arg for k in node.keywords if k.arg)
+            elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+                self.strings.append(node.value)
+        # Calls are qualified after every alias is known.
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Call):
+                callee = self._qualify(node.func)
+                if callee:
+                    self.calls[callee] += 1
+
+    def _index_lines(self, code):
+        """Regex fallback for code that does not parse."""
+        for line in code.splitlines():
+            m = re.match(r"\s*(?:import|from)\s+([\w.]+)", line)
+            if m:
+                self.imports.add(m.group(1))
+            m = re.match(r"\s*([A-Za-z_]\w*)\s*=(?!=)", line)
+            if m:
+                self.assigned_names.add(m.group(1))
+            m = re.match(r"\s*def\s+(\w+)", line)
+            if m:
+                self.function_defs.add(m.group(1))
+        for callee in re.findall(r"([A-Za-z_][\w.]*)\s*\(", code):
+            if not keyword.iskeyword(callee):
+                self.calls[callee] += 1
+        self.keywords.update(re.findall(r"[(,]\s*([A-Za-z_]\w*)\s*=(?!=)", code))
+
+    # ── tokenize pass ────────────────────────────────────────────────────────
+    def _index_tokens(self, code):
+        tokens = list(tokenize.generate_tokens(io.StringIO(code).readline))
+        significant = [t for t in tokens if t.type not in (
+            tokenize.NL, tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT,
+            tokenize.COMMENT, tokenize.ENDMARKER)]
+
+        depth = 0
+        lambdas = []                     # depths of open `lambda …:` parameter lists
+        for i, tok in enumerate(significant):
+            if tok.type == tokenize.NAME and tok.string == "lambda":
+                lambdas.append(depth)
+                continue
+            if tok.type != tokenize.OP:
+                continue
+            if tok.string in _OPENERS:
+                depth += 1
+            elif tok.string in _CLOSERS:
+                depth = max(0, depth - 1)
+            elif tok.string == ":" and lambdas and lambdas[-1] == depth:
+                lambdas.pop()
+            elif tok.string in _SPACED_OPS:
+                if tok.string == "=" and (depth or (lambdas and lambdas[-1] == depth)):
+                    continue                             # keyword argument / default
+                prev = significant[i - 1] if i else None
+                nxt = significant[i + 1] if i + 1 < len(significant) else None
+                if tok.string in "+-*" and self._is_unary(prev):
+                    continue
+                tight_before = prev is not None and prev.end == tok.start
+                tight_after = nxt is not None and nxt.start == tok.end
+                if tight_before or tight_after:
+                    self.spacing_issues += 1
+
+        in_block = False
+        for tok in tokens:
+            if tok.type == tokenize.COMMENT:
+                self.comment_count += 1
+            elif tok.type == tokenize.NL and not tok.line.strip():
+                self.blank_lines += 1
+                in_block = False
+            elif tok.type == tokenize.NEWLINE and not in_block:
+                self.code_blocks += 1
+                in_block = True
+
+    @staticmethod
+    def _is_unary(prev):
+        """`-x`, `*args`, `f(-1)`: the operator follows an operator/keyword."""
+        if prev is None:
+            return True
+        if prev.type == tokenize.OP:
+            return prev.string not in _CLOSERS
+        return prev.type == tokenize.NAME and keyword.iskeyword(prev.string)
+
+    def _index_layout(self, code):
+        """Line-based fallback when the code cannot even be tokenized."""
+        in_block = False
+        for line in code.splitlines():
+            stripped = line.strip()
+            if not stripped:
+                self.blank_lines += 1
+                in_block = False
+                continue
+            if stripped.startswith("#"):
+                self.comment_count += 1
+                continue
+            if "#" in stripped:
+                self.comment_count += 1
+            if not in_block:
+                self.code_blocks += 1
+                in_block = True
+        self.spacing_issues = len(re.findall(r"\S[=<>+*/-]\S", code))
+
+
+@lru_cache(maxsize=256)
+def analyze(code):
+    """Return the (memoized) `CodeFeatures` of `code`; treat it as read-only."""
+    with span("grade.analyze", chars=len(code or "")):
+        return CodeFeatures(code or "")
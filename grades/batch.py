@@ -0,0 +1,53 @@
+# grades/batch.py – assignment-agnostic grading entry point for batch jobs
+"""
+The Streamlit pages grade one submission each, with the rubric inputs
+wired up by hand (as4 derives its rectangle score from a text box, as2/3
+pass uploaded bytes, …).  `grade_submission()` does the same wiring for
+any assignment from a plain mapping of artifacts, so it can run inside a
+grading worker:
+
+    get_grading_pool().submit("grades.batch:grade_submission",
+                              "as2", code, {"map.html": b"...", ...})
+
+`ARTIFACTS` names the files each assignment expects.
+"""
+
+ASSIGNMENTS = ("as1", "as2", "as3", "as4")
+
+ARTIFACTS = {
+    "as1": (),
+    "as2": ("map.html", "chart.png", "summary.csv"),
+    "as3": ("map.html", "sheet.xlsx"),
+    "as4": ("coordinates.txt", "thresholded.png", "outlined.png"),
+}
+
+
+def grade_submission(assignment, code, artifacts):
+    """
+    Grade one stored submission and return its total score (0-100).
+
+    `artifacts` maps the names in `ARTIFACTS[assignment]` to bytes; missing
+    uploads grade as empty.  Raises ValueError for an unknown assignment.
+    """
+    if assignment not in ARTIFACTS:
+        raise ValueError(f"Unknown assignment: {assignment!r}")
+    files = [artifacts.get(name, b"") for name in ARTIFACTS[assignment]]
+
+    if assignment == "as1":
+        from grades.grade1 import grade_assignment
+        return grade_assignment(code)          # already inside a worker
+    if assignment == "as2":
+        from grades.grade2 import grade_assignment
+        return grade_assignment(code, *files)
+    if assignment == "as3":
+        from grades.grade3 import grade_assignment
+        return grade_assignment(code, *files)[0]
+
+    from grades.grade4 import grade_assignment, rectangle_grade, image_grade
+    coordinates, thresholded, outlined = files
+    return grade_assignment(
+        code,
+        rectangle_grade(coordinates.decode("utf-8", "replace")),
+        image_grade(thresholded),
+        image_grade(outlined),
+    )[0]
@@ -0,0 +1,173 @@
+# grades/cache.py – content-hash memoization of grading results
+"""
+Students resubmit the same code and files until they clear 70.  Every
+grade is therefore memoized under a SHA-256 of:
+
+    grader module + grader *source files* + code + uploaded file bytes
+    + any extra scalar arguments
+
+Hashing the grader's own source – and the shared grading modules it
+relies on, grades/analysis.py and grades/inputs.py – means editing a
+rubric invalidates its old entries automatically; there is no version
+number to remember to bump.
+
+Entries live in a process-wide LRU shared by all sessions.  Set
+GRADE_CACHE_DB=1 to also persist them in the `grade_cache` MySQL table
+(see migrations.py), so they survive restarts and are shared
+between workers.  Database trouble never blocks grading; the cache just
+misses.
+
+    from grades.cache import cached_grade
+    grade = cached_grade(grade_assignment, code, uploaded_html.getvalue())
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+from tracing import span
+
+PERSIST = os.getenv("GRADE_CACHE_DB", "0") == "1"
+MAX_ENTRIES = int(os.getenv("GRADE_CACHE_SIZE", "2048"))
+
+_lock = threading.Lock()
+_memory = OrderedDict()          # cache_key → result
+_source_hashes = {}              # module file → (mtime_ns, sha256)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Keys                                                                         │
+# ──────────────────────────────────────────────────────────────────────────────
+# Modules every grader scores or decodes through; editing one changes
+# grades just like editing gradeN.py does.
+SHARED_SOURCES = tuple(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+    for name in ("analysis.py", "inputs.py")
+)
+
+
+def _file_hash(path):
+    """SHA-256 of `path`, re-hashed only when its mtime changes."""
+    mtime = os.stat(path).st_mtime_ns
+    cached = _source_hashes.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, "rb") as f:
+            cached = (mtime, hashlib.sha256(f.read()).hexdigest())
+        _source_hashes[path] = cached
+    return cached[1]
+
+
+def grader_version(grade_fn):
+    """Hash of the file defining `grade_fn` plus the shared grading modules."""
+    paths = (sys.modules[grade_fn.__module__].__file__, *SHARED_SOURCES)
+    return hashlib.sha256("".join(_file_hash(p) for p in paths).encode()).hexdigest()
+
+
+def _as_bytes(part):
+    if isinstance(part, str):
+        return part.encode("utf-8")
+    if isinstance(part, (bytes, bytearray, memoryview)):
+        return bytes(part)
+    return repr(part).encode("utf-8")
+
+
+def grade_key(grade_fn, code, *args, artifacts=()):
+    """Cache key for grading `code` (+ scalar `args` and file `artifacts`)."""
+    h = hashlib.sha256()
+    for part in (f"{grade_fn.__module__}.{grade_fn.__qualname__}",
+                 grader_version(grade_fn), code, *args, *artifacts):
+        data = _as_bytes(part)
+        h.update(len(data).to_bytes(8, "big"))   # length-prefix: no ambiguous joins
+        h.update(data)
+    return h.hexdigest()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Storage                                                                      │
+# ──────────────────────────────────────────────────────────────────────────────
+def _encode(value):
+    return json.dumps({"tuple": isinstance(value, tuple), "value": value})
+
+
+def _decode(text):
+    data = json.loads(text)
+    return tuple(data["value"]) if data["tuple"] else data["value"]
+
+
+def _remember(key, value):
+    with _lock:
+        _memory[key] = value
+        _memory.move_to_end(key)
+        while len(_memory) > MAX_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def get_cached(key, default=None):
+    """Return the cached grade for `key`, or `default` on a miss."""
+    with _lock:
+        if key in _memory:
+            _memory.move_to_end(key)
+            return _memory[key]
+
+    if PERSIST:
+        try:
+            from db_pool import get_conn
+            with get_conn() as conn:
+                cur = conn.cursor()
+                cur.execute("SELECT result FROM grade_cache WHERE cache_key = %s", (key,))
+                row = cur.fetchone()
+            if row:
+                value = _decode(row[0])
+                _remember(key, value)
+                return value
+        except Exception:
+            pass
+    return default
+
+
+def store(key, value, assignment=""):
+    """Cache `value` (a grade or a (grade, breakdown) tuple) under `key`."""
+    _remember(key, value)
+    if PERSIST:
+        try:
+            from db_pool import get_conn
+            with get_conn() as conn:
+                cur = conn.cursor()
+                cur.execute(
+                    "INSERT IGNORE INTO grade_cache (cache_key, assignment, result) "
+                    "VALUES (%s, %s, %s)",
+                    (key, assignment, _encode(value)),
+                )
+                conn.commit()
+        except Exception:
+            pass
+
+
+def clear():
+    """Drop the in-process cache (persisted rows are left alone)."""
+    with _lock:
+        _memory.clear()
+
+
+def cached_grade(grade_fn, code, *args, artifacts=(), **kwargs):
+    """
+    `grade_fn(code, *args, **kwargs)`, memoized.  Byte arguments are
+    hashed as-is; when a grader is handed paths instead, pass the file
+    bytes as `artifacts` (paths alone say nothing about content).
+    `kwargs` are not part of the key and must follow from the code and
+    artifacts.
+    """
+    assignment = grade_fn.__module__.rsplit(".", 1)[-1]
+    with span("grade", assignment=assignment) as grade:
+        with span("grade.lookup"):
+            key = grade_key(grade_fn, code, *args, artifacts=artifacts)
+            value = get_cached(key)
+        grade.set(cache_hit=value is not None)
+        if value is None:
+            with span("grade.evaluate"):
+                value = grade_fn(code, *args, **kwargs)
+            with span("grade.store"):
+                store(key, value, assignment=assignment)
+    return value
@@ -1,15 +1,26 @@
-def grade_assignment(code):
+from grades.analysis import analyze
+
+
+def grade_assignment(code, run_result=None):
     """
     Calculates a numeric grade for the assignment based on the user's code.
+
+    `run_result` is the cached outcome of running this exact code through
+    `grades.sandbox.run_code` ({"ok": bool, "dataframes": {name: df}, ...}).
+    When given, the code is not executed a second time.
     """
     import pandas as pd
     import re
 
     grade = 0
+    features = analyze(code)
 
     # a. Library Imports (5 points)
     required_imports = ["folium", "geopy", "geodesic", "pandas"]
-    imported_libraries = sum(1 for lib in required_imports if lib in code)
+    imported_libraries = sum(
+        1 for lib in required_imports
+        if features.imports_module(lib) or lib in features.imported_names
+    )
     grade += min(5, imported_libraries * 1.25)
 
     # b. Coordinate Handling (5 points)
@@ -18,49 +29,53 @@ def grade_assignment(code):
     grade += min(5, correct_coordinates * (5 / 3))
 
     # c. Code Execution (10 points)
-    try:
+    if run_result is None:
         local_context = {}
-        exec(code, {}, local_context)
+        try:
+            exec(code, {}, local_context)
+            ran_ok = True
+        except Exception as e:
+            print(f"Execution Error: {e}")
+            ran_ok = False
+        dataframes = [v for v in local_context.values() if isinstance(v, pd.DataFrame)]
+    else:
+        ran_ok = run_result["ok"]
+        dataframes = list(run_result.get("dataframes", {}).values())
+    if ran_ok:
         grade += 10  # Full points if the code runs without errors
-    except Exception as e:
-        print(f"Execution Error: {e}")
 
     # d. Code Quality (10 points)
     code_quality_issues = 0
-    if any(f" {char} =" in code or f" {char}=" in code for char in "abcdefghijklmnopqrstuvwxyz"):
+    if features.single_letter_names:      # single-letter variables
         code_quality_issues += 1
-    if "=" in code.replace(" = ", ""):
+    if features.spacing_issues:           # operators without surrounding spaces
         code_quality_issues += 1
-    if "#" not in code:
+    if not features.comment_count:
         code_quality_issues += 1
-    if "\n\n" not in code:
+    if not features.blank_lines:
         code_quality_issues += 1
     grade += max(0, 10 - code_quality_issues * 2.5)
 
     # 2. Map Visualization (40 points)
-    if "folium.Map" in code:
+    if features.called("folium.Map"):
         grade += 15
 
-    marker_count = code.count("folium.Marker")
+    marker_count = features.call_count("folium.Marker")
     grade += min(15, marker_count * 5)
 
-    if "PolyLine" in code:
+    if features.called("PolyLine"):
         grade += 5
 
-    if "popup=" in code:
+    if "popup" in features.keywords:
         grade += 5
 
     # 3. Distance Calculations (30 points)
-    if "geodesic" in code:
+    if features.called("geodesic"):
         grade += 10  # Full points for geodesic implementation
 
         # Verify accuracy of distance calculations
         try:
-            distances_df = None
-            for var_name, var_value in local_context.items():
-                if isinstance(var_value, pd.DataFrame):
-                    distances_df = var_value
-                    break
+            distances_df = dataframes[0] if dataframes else None
 
             actual_distances = []
 
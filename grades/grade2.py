@@ -1,13 +1,21 @@
 
 import re
+import io
 import csv
 import math
-import os
 from PIL import Image
 
-def grade_assignment(code, html_path, png_path, csv_path):
+from grades.analysis import analyze
+from grades.inputs import read_bytes, read_text
+
+def grade_assignment(code, html_file, png_file, csv_file):
+    """
+    Grades Assignment 2.  The three uploads may be bytes, memoryviews,
+    binary buffers or paths (see grades.inputs).  Returns the total score.
+    """
     total_score = 0
     debug_info = []
+    features = analyze(code)
 
     ##########################################
     # 1. Library Imports (20 Points)
@@ -26,19 +34,19 @@ def grade_assignment(code, html_path, png_path, csv_path):
     }
     
     # Check for folium
-    if re.search(r"(?i)(import|from)\s+folium\b", code):
+    if features.imports_module("folium"):
         required_libraries['folium'] = True
 
     # Check for matplotlib or seaborn
-    if re.search(r"(?i)(import|from)\s+matplotlib\b", code) or re.search(r"(?i)(import|from)\s+seaborn\b", code):
+    if features.imports_module("matplotlib") or features.imports_module("seaborn"):
         required_libraries['matplotlib_or_seaborn'] = True
 
     # Check for requests or urllib
-    if re.search(r"(?i)(import|from)\s+requests\b", code) or re.search(r"(?i)(import|from)\s+urllib\b", code):
+    if features.imports_module("requests") or features.imports_module("urllib"):
         required_libraries['requests_or_urllib'] = True
 
     # Check for pandas
-    if re.search(r"(?i)(import|from)\s+pandas\b", code):
+    if features.imports_module("pandas"):
         required_libraries['pandas'] = True
 
     # Each group is worth 5 points:
@@ -52,22 +60,21 @@ def grade_assignment(code, html_path, png_path, csv_path):
     ##########################################
     # a) Descriptive Variable Names (5 Points)
     naming_score = 0
-    if re.search(r"\bearthquake_map\b", code):
+    if "earthquake_map" in features.assigned_names:
         naming_score += 5
-    if re.search(r"\bmagnitude_counts\b", code):
+    if "magnitude_counts" in features.assigned_names:
         naming_score += 5
     naming_score = min(5, naming_score)
     
-    # b) Spacing After Operators (5 Points)
-    # Fix: Escape the '-' character or place it at the end of the character class
-    spacing_score = 5 if not re.search(r"\S[=<>+*/-]{1}\S", code) else 2.5
+    # b) Spacing Around Operators (5 Points)
+    # Keyword arguments, unary minus and text inside strings are not operators.
+    spacing_score = 5 if not features.spacing_issues else 2.5
 
     # c) Comments (5 Points)
-    comment_lines = sum(1 for line in code.splitlines() if line.strip().startswith("#"))
-    comments_score = min(5, (comment_lines / 3) * 5)
+    comments_score = min(5, (features.comment_count / 3) * 5)
     
     # d) Code Organization (5 Points)
-    organization_score = 5 if re.search(r"\n\s*\n", code) else 0
+    organization_score = 5 if features.blank_lines else 0
 
     quality_score = naming_score + spacing_score + comments_score + organization_score
     quality_score = min(20, quality_score)
@@ -100,8 +107,7 @@ def grade_assignment(code, html_path, png_path, csv_path):
     ##########################################
     map_score = 0
     try:
-        with open(html_path, "r", encoding="utf-8") as f:
-            html_content = f.read().lower()
+        html_content = read_text(html_file).lower()
         
         # (a) Markers (10 points): Check for substring "marker("
         if "marker(" in html_content:
@@ -125,7 +131,7 @@ def grade_assignment(code, html_path, png_path, csv_path):
     # Check that the PNG file is non-empty.
     bar_chart_score = 0
     try:
-        if os.path.getsize(png_path) > 0:
+        if len(read_bytes(png_file)) > 0:
             bar_chart_score = 5
     except Exception as e:
         debug_info.append(f"Bar chart file error: {e}")
@@ -147,7 +153,7 @@ def grade_assignment(code, html_path, png_path, csv_path):
     
     found_values = {metric: False for metric in correct_values}
     try:
-        with open(csv_path, newline="") as csvfile:
+        with io.StringIO(read_text(csv_file), newline="") as csvfile:
             reader = csv.reader(csvfile)
             for row in reader:
                 for cell in row:
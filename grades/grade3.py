@@ -1,22 +1,28 @@
 import pandas as pd
 
-def grade_assignment(code, html_path, excel_path):
+from grades.analysis import analyze
+from grades.inputs import as_binary_file, read_text
+
+def grade_assignment(code, html_file, excel_file):
     """
     Grades Assignment 3 based on the provided code, HTML file, and Excel file.
+    The files may be bytes, memoryviews, binary buffers or paths.
     Returns a numerical grade (0-100) with breakdowns.
     """
     total_score = 0
     grading_breakdown = {}
+    features = analyze(code)
 
     #### Part 1: Code Grading (45 Points Total) ####
 
     # Library Imports (15 Points)
     lib_points = 0
-    if any(lib in code for lib in ["gspread", "pygsheets", "google-api-python-client"]):
+    # google-api-python-client installs as the `googleapiclient` package
+    if any(features.imports_module(lib) for lib in ["gspread", "pygsheets", "googleapiclient"]):
         lib_points += 6
-    if any(lib in code for lib in ["pandas", "numpy"]):
+    if any(features.imports_module(lib) for lib in ["pandas", "numpy"]):
         lib_points += 2
-    if any(lib in code for lib in ["folium", "plotly", "geopandas", "matplotlib"]):
+    if any(features.imports_module(lib) for lib in ["folium", "plotly", "geopandas", "matplotlib"]):
         lib_points += 7
     grading_breakdown["Library Imports"] = lib_points
     total_score += lib_points
@@ -24,13 +30,13 @@ def grade_assignment(code, html_path, excel_path):
     # Code Quality (20 Points)
     quality_points = 0
     descriptive_keywords = ["student_id", "code_input", "temperature", "longitude", "latitude"]
-    if any(word in code for word in descriptive_keywords):
+    if any(word in name for name in features.assigned_names for word in descriptive_keywords):
         quality_points += 5
-    if " = " in code:
+    if features.assigned_names and not features.spacing_issues:
         quality_points += 5
-    if "#" in code:
+    if features.comment_count:
         quality_points += 5
-    if "def " in code:
+    if features.function_defs:
         quality_points += 5
     grading_breakdown["Code Quality"] = quality_points
     total_score += quality_points
@@ -54,12 +60,11 @@ def grade_assignment(code, html_path, excel_path):
     #### Part 2: HTML File Grading (10 Points Total) ####
     html_points = 0
     try:
-        with open(html_path, "r", encoding="utf-8") as f:
-            html_content = f.read().lower()
-            if "blue" in html_content:
-                html_points += 5
-            if "red" in html_content:
-                html_points += 5
+        html_content = read_text(html_file).lower()
+        if "blue" in html_content:
+            html_points += 5
+        if "red" in html_content:
+            html_points += 5
     except Exception as e:
         print(f"Error reading HTML file: {e}")
     grading_breakdown["HTML File"] = html_points
@@ -69,7 +74,7 @@ def grade_assignment(code, html_path, excel_path):
     excel_points = 0
     try:
         # Load the uploaded Excel file
-        uploaded_xl = pd.ExcelFile(excel_path)
+        uploaded_xl = pd.ExcelFile(as_binary_file(excel_file))
 
         # 1. Correct Sheets (15 Points)
         expected_sheets = ['Sheet1', 'Above_25', 'Below_25']
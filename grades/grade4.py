@@ -1,7 +1,37 @@
+import re
+import collections
+
+from grades.analysis import analyze
+
+# Rectangle corners (x1, y1, x2, y2 …) of the reference solution.
+CORRECT_RECTANGLE_VALUES = [
+    974, 768, 1190, 890, 270, 768, 486, 889, 37, 768, 253, 890,
+    1207, 768, 1423, 890, 740, 768, 955, 890, 505, 768, 720, 890,
+    92, 618, 234, 660, 206, 511, 349, 554, 367, 438, 509, 480,
+    523, 380, 665, 422, 629, 289, 772, 332, 788, 212, 930, 254,
+    37, 136, 471, 298, 1238, 98, 1380, 141
+]
+
+
+def rectangle_grade(coordinates_text):
+    """One point per correct number, order-independent (max 56)."""
+    student_vals = []
+    for line in coordinates_text.splitlines():
+        student_vals += list(map(int, re.findall(r"\d+", line)))
+    correct = collections.Counter(CORRECT_RECTANGLE_VALUES)
+    student = collections.Counter(student_vals)
+    return sum(min(correct[v], student[v]) for v in correct)
+
+
+def image_grade(image):
+    """5 points if an image was uploaded."""
+    return 5 if image else 0
+
 
 def grade_assignment(code_input, rectangle_grade, thresholded_image_grade, outlined_image_grade):
     total_grade = 0
     grading_breakdown = {}
+    features = analyze(code_input)
 
     # 1. Library Imports (Up to 20 Points)
     # Modified: 8 points for "cv2", 6 points for "numpy", and 6 points for "matplotlib".
@@ -12,17 +42,17 @@ def grade_assignment(code_input, rectangle_grade, thresholded_image_grade, outli
     }
     library_score = 0
     for lib, points in libraries.items():
-        if lib in code_input:
+        if features.imports_module(lib):
             library_score += points
     grading_breakdown["Library Imports"] = min(library_score, 20)
     total_grade += grading_breakdown["Library Imports"]
 
     # 2. Code Quality (Supposedly 14 Points)
     code_quality = {
-        "Variable Naming": 4 if "x" not in code_input or "y" not in code_input else 0,
-        "Spacing": 2 if " =" not in code_input and "= " not in code_input else 0,
-        "Comments": 2 if "#" in code_input else 0,
-        "Code Organization": 2 if "\n\n" in code_input else 0,
+        "Variable Naming": 4 if not features.single_letter_names else 0,
+        "Spacing": 2 if not features.spacing_issues else 0,
+        "Comments": 2 if features.comment_count else 0,
+        "Code Organization": 2 if features.blank_lines else 0,
     }
     grading_breakdown["Code Quality"] = sum(code_quality.values())
     total_grade += grading_breakdown["Code Quality"]
@@ -0,0 +1,40 @@
+# grades/inputs.py – accept uploads as paths *or* in-memory buffers
+"""
+Graders used to reopen fixed temp files (temp_uploads/uploaded_map.html…),
+which cost disk round trips and let concurrent submissions overwrite each
+other.  They now take any of:
+
+    • bytes / bytearray / memoryview  (e.g. st.file_uploader().getvalue())
+    • a binary file-like object        (BytesIO, Streamlit UploadedFile)
+    • a filesystem path                (batch tools, old callers)
+"""
+import io
+import os
+
+
+def read_bytes(source):
+    """Return the full contents of `source` as bytes."""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, memoryview):
+        return source.tobytes()
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    if hasattr(source, "read"):
+        return source.read()
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return f.read()
+    raise TypeError(f"Unsupported upload type: {type(source).__name__}")
+
+
+def read_text(source, encoding="utf-8"):
+    """Return `source` decoded as text."""
+    return read_bytes(source).decode(encoding)
+
+
+def as_binary_file(source):
+    """Return a seekable binary file object (for pandas.ExcelFile, PIL…)."""
+    if isinstance(source, (str, os.PathLike)):
+        return source                     # readers open paths themselves
+    return io.BytesIO(read_bytes(source))
@@ -0,0 +1,292 @@
+# grades/sandbox.py – out-of-process execution pool for student code and graders
+"""
+Student code used to run through `exec()` inside the Streamlit server,
+with `sys.stdout` swapped process-wide.  One `while True:` or a heavy
+import froze every connected user.
+
+This module runs that work in separate worker processes instead:
+
+    from grades.sandbox import get_grading_pool
+
+    result = get_grading_pool().run("grades.sandbox:run_code", code)
+    result["ok"], result["value"], result["stdout"], result["error"]
+
+Each job gets a wall-clock timeout, a CPU-seconds limit and an
+address-space cap (RLIMIT_CPU / RLIMIT_AS, POSIX only).  A job that blows
+a limit kills its worker, which is replaced transparently; the caller gets
+`{"ok": False, "timed_out": True, ...}` back instead of a hung page.
+Output printed by the job is captured inside the worker.
+
+This is isolation, not a security boundary: student code still runs with
+the server's user permissions.
+
+Tuning via environment variables:
+    GRADER_WORKERS        worker processes          (default: CPU count, max 4)
+    GRADER_WALL_TIMEOUT   seconds per job           (default 30)
+    GRADER_CPU_TIMEOUT    CPU seconds per job       (default 20)
+    GRADER_MEMORY_MB      address-space cap per job (default 2048)
+"""
+import contextlib
+import importlib
+import io
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from tracing import span
+
+try:
+    import resource                       # POSIX only
+except ImportError:                       # pragma: no cover – Windows
+    resource = None
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Jobs (run inside the worker)                                                 │
+# ──────────────────────────────────────────────────────────────────────────────
+def run_code(code):
+    """
+    Execute `code` and summarise what it left behind.
+
+    Returns a dict with:
+        locals      – {name: type name} for every top-level variable
+        dataframes  – {name: pandas.DataFrame}
+        maps_html   – {name: rendered HTML} for every folium.Map
+    Exceptions propagate and are reported through the job envelope.
+    """
+    local_ctx = {}
+    exec(code, {}, local_ctx)
+
+    summary = {"locals": {}, "dataframes": {}, "maps_html": {}}
+    for name, obj in local_ctx.items():
+        summary["locals"][name] = type(obj).__name__
+        kind = f"{type(obj).__module__}.{type(obj).__name__}"
+        if kind == "pandas.core.frame.DataFrame":
+            summary["dataframes"][name] = obj
+        elif kind == "folium.folium.Map":
+            summary["maps_html"][name] = obj.get_root().render()
+    return summary
+
+
+def _resolve(target):
+    """'package.module:function' → callable."""
+    module_name, func_name = target.split(":")
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def _set_limits(cpu_seconds, memory_mb):
+    if resource is None:
+        return
+    used = resource.getrusage(resource.RUSAGE_SELF)
+    used_cpu = used.ru_utime + used.ru_stime
+    _soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    # RLIMIT_CPU counts the worker's whole lifetime, so budget from "now".
+    # Only the soft limit moves; SIGXCPU then terminates the worker.
+    resource.setrlimit(resource.RLIMIT_CPU, (int(used_cpu + cpu_seconds) + 1, hard))
+    if memory_mb:
+        _soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_mb * 1024 * 1024, hard))
+
+
+def _worker_main(conn, preload):
+    for name in preload:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        target, args, kwargs, cpu_seconds, memory_mb = message
+
+        captured = io.StringIO()
+        try:
+            _set_limits(cpu_seconds, memory_mb)
+            with contextlib.redirect_stdout(captured):
+                value = _resolve(target)(*args, **kwargs)
+            reply = ("ok", value, captured.getvalue())
+        except BaseException as e:          # SystemExit from student code included
+            reply = ("error", f"{type(e).__name__}: {e}", captured.getvalue(),
+                     traceback.format_exc(limit=5))
+        try:
+            conn.send(reply)
+        except Exception as e:              # unpicklable return value
+            conn.send(("error", f"Result could not be returned: {e}", captured.getvalue(), ""))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Pool (runs in the Streamlit server)                                          │
+# ──────────────────────────────────────────────────────────────────────────────
+class _Worker:
+    def __init__(self, ctx, preload):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, preload), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+
+    def kill(self):
+        try:
+            self.process.kill()
+            self.process.join(1)
+        except Exception:
+            pass
+        self.conn.close()
+
+
+class GradingPool:
+    """
+    Fixed-size pool of persistent worker processes.
+
+    `run()` blocks the calling thread only (each Streamlit session has its
+    own script thread) and never holds the GIL while waiting.  `submit()`
+    returns a Future for fan-out work such as batch regrading.
+
+    By default a worker runs one job and is then replaced: student code can
+    monkeypatch pandas, folium, builtins or grades.* inside the worker, and
+    a reused interpreter would carry that into the next student's grade.
+    The replacement is started (and its `preload` imported) as soon as the
+    old worker is retired, so the next job still finds a warm process.
+    `max_jobs_per_worker` > 1 trades that isolation for throughput: a job
+    can then change the results of up to that many later jobs in the same
+    worker.  Only use it for trusted code.
+    """
+
+    def __init__(self, workers=2, wall_timeout=30, cpu_timeout=20, memory_mb=2048,
+                 max_jobs_per_worker=1, preload=("pandas", "folium")):
+        self.workers = workers
+        self.wall_timeout = wall_timeout
+        self.cpu_timeout = cpu_timeout
+        self.memory_mb = memory_mb
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.preload = tuple(preload)
+
+        self._ctx = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(workers)
+        self._idle = []
+        self._executor = None
+        self._closed = False
+
+    def _checkout(self):
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.process.is_alive():
+                    return worker
+                worker.kill()
+        return _Worker(self._ctx, self.preload)
+
+    def _checkin(self, worker):
+        if worker.jobs >= self.max_jobs_per_worker or not worker.process.is_alive():
+            worker.kill()
+            worker = _Worker(self._ctx, self.preload)    # warm spare for the next job
+        with self._lock:
+            if not self._closed:
+                self._idle.append(worker)
+                return
+        worker.kill()
+
+    def run(self, target, *args, timeout=None, **kwargs):
+        """
+        Run `target` ("module:function") with args in a worker.
+
+        Returns {"ok", "value", "error", "stdout", "timed_out", "seconds"}.
+        """
+        with span("sandbox.run", target=target) as run:
+            result = self._run(target, args, kwargs, timeout or self.wall_timeout)
+            run.set(ok=result["ok"], timed_out=result["timed_out"])
+        return result
+
+    def _run(self, target, args, kwargs, timeout):
+        result = {"ok": False, "value": None, "error": "", "stdout": "",
+                  "timed_out": False, "seconds": 0.0}
+        t0 = time.perf_counter()
+
+        with span("sandbox.queue"):
+            self._slots.acquire()
+        worker = None
+        try:
+            with span("sandbox.checkout"):
+                worker = self._checkout()
+            worker.jobs += 1
+            worker.conn.send((target, args, kwargs, self.cpu_timeout, self.memory_mb))
+
+            with span("sandbox.execute"):
+                replied = worker.conn.poll(timeout)
+            if not replied:
+                worker.kill()
+                worker = None
+                result.update(timed_out=True, error=f"Timed out after {timeout:.0f} s")
+            else:
+                reply = worker.conn.recv()
+                result["stdout"] = reply[2]
+                if reply[0] == "ok":
+                    result.update(ok=True, value=reply[1])
+                else:
+                    result["error"] = reply[1]
+        except (EOFError, OSError):
+            # Worker died mid-job: SIGXCPU (CPU limit), OOM kill or a crash.
+            if worker is not None:
+                worker.kill()
+                worker = None
+            result.update(timed_out=True, error="Worker stopped (CPU/memory limit exceeded or crashed)")
+        finally:
+            if worker is not None:
+                self._checkin(worker)
+            self._slots.release()
+
+        result["seconds"] = time.perf_counter() - t0
+        return result
+
+    def submit(self, target, *args, **kwargs):
+        """Like `run()`, but returns a `concurrent.futures.Future`."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="grader")
+        return self._executor.submit(self.run, target, *args, **kwargs)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            try:
+                worker.conn.send(None)
+            except Exception:
+                pass
+            worker.kill()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Process-wide singleton                                                       │
+# ──────────────────────────────────────────────────────────────────────────────
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_grading_pool():
+    """Return the shared grading pool, configured from GRADER_* env vars."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = GradingPool(
+                    workers=int(os.getenv("GRADER_WORKERS", min(4, os.cpu_count() or 1))),
+                    wall_timeout=float(os.getenv("GRADER_WALL_TIMEOUT", "30")),
+                    cpu_timeout=int(os.getenv("GRADER_CPU_TIMEOUT", "20")),
+                    memory_mb=int(os.getenv("GRADER_MEMORY_MB", "2048")),
+                )
+    return _pool
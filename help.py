@@ -1,15 +1,16 @@
 
 
 import streamlit as st
+from style_registry import inject_css
+
+_HELP_CSS = """
+h1 {color: #add8e6 !important;}
+.orange-header {color: #FFA500 !important;}
+"""
+
 
 def show():
-    custom_css = """
-    <style>
-    h1 {color: #add8e6 !important;}
-    .orange-header {color: #FFA500 !important;}
-    </style>
-    """
-    st.markdown(custom_css, unsafe_allow_html=True)
+    inject_css("help", _HELP_CSS)
 
     st.title("Help & Support")
     st.write("If you need assistance, we're here to help. Please check the options below to find a solution to your problem.")
@@ -0,0 +1,179 @@
+# lesson_cache.py – record static lessons once, replay them on every rerun
+"""
+Most lesson tabs are pure output: a run of `st.markdown`, `st.write`,
+`st.table(pd.DataFrame({...}))` calls that rebuild the same strings and
+DataFrames on every rerun.  `render_lesson(show)` runs such a tab once,
+records each output call with its (already built) arguments into a
+bundle, and replays the bundle afterwards – no DataFrame construction,
+styling or string formatting per request.
+
+Bundles are keyed by the SHA-256 of the lesson's source file, so editing
+a tab invalidates its bundle.  A lesson is only cached when it is
+provably static:
+
+  • its module imports nothing but streamlit, pandas, numpy and the
+    lesson media helpers (lesson_image / asset_image), and
+  • while recording it touches only the output calls in `_OUTPUT_CALLS`
+    (any widget, session_state, sidebar, layout container … marks it
+    dynamic, and it simply runs normally from then on)
+
+Bundles are shared by every session and replayed concurrently, and
+Streamlit mutates a Styler while serializing it (`set_uuid`, `_compute`).
+pandas arguments (DataFrame, Series, Styler) are therefore copied when
+recorded and again for each replay; no two renders touch the same object.
+
+Set LESSON_CACHE=0 to always run lessons directly.
+"""
+import copy
+import hashlib
+import inspect
+import os
+import sys
+import threading
+import types
+
+import streamlit
+
+LESSON_CACHE = os.getenv("LESSON_CACHE", "1") == "1"
+
+_OUTPUT_CALLS = {
+    "markdown", "write", "header", "subheader", "title", "caption", "text",
+    "code", "latex", "divider", "table", "dataframe", "image", "video",
+    "audio", "json", "info", "success", "warning", "error",
+}
+_STATIC_MODULES = {"streamlit", "pandas", "numpy"}
+_STATIC_FUNCTIONS = {("lesson_images", "lesson_image"), ("assets", "asset_image")}
+
+_DYNAMIC = object()
+_lock = threading.Lock()
+_local = threading.local()         # .recording → list of ops, or None
+_bundles = {}                      # (module, qualname) → (source sha256, ops | _DYNAMIC)
+_source_hashes = {}                # path → (mtime_ns, sha256)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Recording proxies (installed into lesson modules in place of the originals)  │
+# ──────────────────────────────────────────────────────────────────────────────
+def _recording():
+    return getattr(_local, "recording", None)
+
+
+def _own(value):
+    """A private copy of pandas objects (mutated on render); others as-is."""
+    if type(value).__module__.startswith("pandas"):
+        return copy.deepcopy(value)
+    return value
+
+
+def _record(ops, func, args, kwargs):
+    ops.append((func, tuple(_own(a) for a in args), {k: _own(v) for k, v in kwargs.items()}))
+
+
+class _StreamlitProxy:
+    """Behaves exactly like `streamlit` unless this thread is recording."""
+
+    def __init__(self, module):
+        self._module = module
+
+    def __getattr__(self, name):
+        attr = getattr(self._module, name)
+        ops = _recording()
+        if ops is None:
+            return attr
+        if name not in _OUTPUT_CALLS:
+            _local.dynamic = True
+            return attr
+
+        def record(*args, **kwargs):
+            _record(ops, attr, args, kwargs)
+            return attr(*args, **kwargs)
+        return record
+
+
+class _RecordingFunction:
+    def __init__(self, func):
+        self._func = func
+
+    def __call__(self, *args, **kwargs):
+        ops = _recording()
+        if ops is not None:
+            _record(ops, self._func, args, kwargs)
+        return self._func(*args, **kwargs)
+
+
+def _prepare_module(module):
+    """Install proxies into `module`; returns False if it is not static."""
+    if getattr(module, "__lesson_cache_static__", None) is not None:
+        return module.__lesson_cache_static__
+
+    static = True
+    for name, value in list(vars(module).items()):
+        if name.startswith("__") or isinstance(value, (_StreamlitProxy, _RecordingFunction)):
+            continue
+        if isinstance(value, types.ModuleType):
+            if value.__name__.split(".")[0] not in _STATIC_MODULES:
+                static = False
+            elif value is streamlit:
+                setattr(module, name, _StreamlitProxy(value))
+        elif callable(value) and getattr(value, "__module__", module.__name__) != module.__name__:
+            if (value.__module__, value.__name__) in _STATIC_FUNCTIONS:
+                setattr(module, name, _RecordingFunction(value))
+            else:
+                static = False
+    module.__lesson_cache_static__ = static
+    return static
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Bundles                                                                      │
+# ──────────────────────────────────────────────────────────────────────────────
+def _source_hash(path):
+    mtime = os.stat(path).st_mtime_ns
+    cached = _source_hashes.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, "rb") as f:
+            cached = (mtime, hashlib.sha256(f.read()).hexdigest())
+        _source_hashes[path] = cached
+    return cached[1]
+
+
+def render_lesson(show):
+    """Render a lesson's `show()`, replaying its recorded bundle when static."""
+    module = sys.modules.get(getattr(show, "__module__", None))
+    if not LESSON_CACHE or module is None or _recording() is not None:
+        return show()
+    try:
+        source_hash = _source_hash(inspect.getsourcefile(show))
+    except (OSError, TypeError):
+        return show()
+
+    key = (module.__name__, show.__qualname__)
+    entry = _bundles.get(key)
+    if entry and entry[0] == source_hash:
+        if entry[1] is _DYNAMIC:
+            return show()
+        for func, args, kwargs in entry[1]:
+            func(*map(_own, args), **{k: _own(v) for k, v in kwargs.items()})
+        return None
+
+    with _lock:
+        static = _prepare_module(module)
+    if not static:
+        _bundles[key] = (source_hash, _DYNAMIC)
+        return show()
+
+    ops = []
+    _local.recording, _local.dynamic = ops, False
+    try:
+        result = show()
+    finally:
+        dynamic = _local.dynamic
+        _local.recording = None
+    _bundles[key] = (source_hash, _DYNAMIC if dynamic else ops)
+    return result
+
+
+def clear():
+    """Drop every bundle (they rebuild on next view)."""
+    with _lock:
+        _bundles.clear()
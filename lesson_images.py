@@ -0,0 +1,152 @@
+# lesson_images.py – responsive, recompressed derivatives of the lesson photos
+"""
+The week-4 lessons showed 1024×1024 PNGs of 2–2.8 MB each straight from
+`photos/`, so one visit to a tab shipped 5–10 MB of images.
+
+`lesson_image()` is a drop-in for `st.image(path, ...)` that serves a
+derivative instead:
+
+  • resized to a width bucket (WIDTH_BUCKETS, never upscaled)
+  • re-encoded as WebP (or palette-optimized PNG if Pillow lacks WebP)
+  • written once to `.cache/lesson_images/<source-sha256>-<width>.<ext>`,
+    so an edited photo gets a new file and unchanged ones are never
+    re-encoded, across restarts too
+
+Streamlit serves local image files as-is (no re-encode) and dedupes them
+in its media cache, so the browser receives ~100 KB instead of ~2.5 MB.
+If Pillow is missing or a conversion fails, the original file is shown.
+
+Derivatives are built lazily on first view; to pre-build them all:
+
+    python lesson_images.py            # every photos/*.png, every bucket
+
+Tuning via environment variables:
+    LESSON_IMAGE_WIDTH     default display width in px  (default 1024)
+    LESSON_IMAGE_QUALITY   WebP quality 1-100            (default 80)
+"""
+import glob
+import hashlib
+import os
+import sys
+import threading
+
+import streamlit as st
+
+from tracing import span
+
+WIDTH_BUCKETS = (480, 768, 1024, 1600)
+DEFAULT_WIDTH = int(os.getenv("LESSON_IMAGE_WIDTH", "1024"))
+QUALITY = int(os.getenv("LESSON_IMAGE_QUALITY", "80"))
+CACHE_DIR = os.path.join(".cache", "lesson_images")
+
+_lock = threading.Lock()     # guards _key_locks only
+_key_locks = {}              # (path, bucket) → lock held while that derivative is built
+_source_hashes = {}          # path → ((mtime_ns, size), sha256)
+_derivatives = {}            # (path, bucket) → ((mtime_ns, size), derivative path)
+
+
+def _bucket(width):
+    """Smallest bucket that covers `width` pixels."""
+    for bucket in WIDTH_BUCKETS:
+        if bucket >= width:
+            return bucket
+    return WIDTH_BUCKETS[-1]
+
+
+def _source_hash(path, stamp):
+    cached = _source_hashes.get(path)
+    if cached is None or cached[0] != stamp:
+        with open(path, "rb") as f:
+            cached = (stamp, hashlib.sha256(f.read()).hexdigest())
+        _source_hashes[path] = cached
+    return cached[1]
+
+
+def _encode(path, bucket, target_base):
+    """Write the derivative for `path` at `bucket` px; returns its path."""
+    from PIL import Image, features
+
+    with Image.open(path) as img:
+        img.load()
+    if img.width > bucket:
+        img = img.resize((bucket, round(img.height * bucket / img.width)), Image.LANCZOS)
+    has_alpha = img.mode in ("RGBA", "LA") or "transparency" in img.info
+
+    if features.check("webp"):
+        target = target_base + ".webp"
+        img = img.convert("RGBA" if has_alpha else "RGB")
+        save = dict(format="WEBP", quality=QUALITY, method=6)
+    else:
+        target = target_base + ".png"
+        img = img.convert("RGBA").quantize(256, method=Image.FASTOCTREE) if has_alpha \
+            else img.convert("RGB").quantize(256)
+        save = dict(format="PNG", optimize=True)
+
+    tmp = f"{target}.{os.getpid()}.tmp"
+    img.save(tmp, **save)
+    os.replace(tmp, target)          # atomic: concurrent builders cannot clash
+    return target
+
+
+def derivative_path(path, width=None):
+    """
+    Path of the resized/recompressed copy of `path` for a display `width`
+    (default DEFAULT_WIDTH), building it if needed.  Falls back to `path`.
+    """
+    bucket = _bucket(width or DEFAULT_WIDTH)
+    try:
+        info = os.stat(path)
+    except OSError:
+        return path
+    stamp = (info.st_mtime_ns, info.st_size)
+
+    key = (path, bucket)
+    cached = _derivatives.get(key)
+    if cached and cached[0] == stamp:
+        return cached[1]                 # fast path: no lock
+
+    # Only builders of the *same* derivative wait for each other; an encode
+    # (WebP method=6 takes seconds) never blocks other images or buckets.
+    with _lock:
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+    with key_lock:
+        cached = _derivatives.get(key)
+        if cached and cached[0] == stamp:
+            return cached[1]             # built while we waited
+        try:
+            base = os.path.join(CACHE_DIR, f"{_source_hash(path, stamp)}-{bucket}")
+            for ext in (".webp", ".png"):
+                if os.path.exists(base + ext):
+                    target = base + ext
+                    break
+            else:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                with span("asset.derive", path=path, width=bucket):
+                    target = _encode(path, bucket, base)
+        except Exception:
+            target = path
+        _derivatives[key] = (stamp, target)
+        return target
+
+
+def lesson_image(path, caption=None, width=None, **kwargs):
+    """`st.image()` for lesson media: same arguments, right-sized file."""
+    if width is not None:
+        kwargs["width"] = width
+    st.image(derivative_path(path, width), caption=caption, **kwargs)
+
+
+def build_all(pattern=os.path.join("photos", "*.png")):
+    """Pre-build every bucket for every file matching `pattern`."""
+    built = 0
+    for path in sorted(glob.glob(pattern)):
+        for bucket in WIDTH_BUCKETS:
+            target = derivative_path(path, bucket)
+            if target != path:
+                built += 1
+                print(f"{path} → {target} ({os.path.getsize(target) // 1024} KB)")
+    return built
+
+
+if __name__ == "__main__":
+    sys.exit(0 if build_all(*sys.argv[1:]) else 1)
@@ -1,30 +1,14 @@
 # login.py – user authentication + registration (MySQL only, no GitHub backup)
 import streamlit as st
-import mysql.connector
-from mysql.connector import errorcode, IntegrityError
+from mysql.connector import IntegrityError
 import smtplib
 from email.message import EmailMessage
 import datetime
 
-from database import create_tables
+from db_pool import get_conn
 from theme import apply_dark_theme
 
 
-# ──────────────────────────────────────────────────────────────────────────────
-# DB helper                                                                    │
-# ──────────────────────────────────────────────────────────────────────────────
-def _get_conn():
-    cfg = st.secrets["mysql"]
-    return mysql.connector.connect(
-        host=cfg["host"],
-        port=int(cfg.get("port", 3306)),
-        user=cfg["user"],
-        password=cfg["password"],
-        database=cfg["database"],
-        autocommit=False,
-    )
-
-
 # ──────────────────────────────────────────────────────────────────────────────
 # Email helper                                                                 │
 # ──────────────────────────────────────────────────────────────────────────────
@@ -68,30 +52,27 @@ def register_user(fullname, email, phone, username, password, date_of_joining):
     Registers a new user in the MySQL database with approved status 0.
     Returns True on success, False otherwise.
     """
-    conn = _get_conn()
-    cur  = conn.cursor()
-
-    # Ensure password is unique
-    cur.execute("SELECT 1 FROM users WHERE password = %s", (password,))
-    if cur.fetchone():
-        conn.close()
-        return False
-
-    try:
-        cur.execute(
-            """
-            INSERT INTO users
-                (fullname, email, phone, username, password, date_of_joining)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            """,
-            (fullname, email, phone, username, password, date_of_joining),
-        )
-        conn.commit()
-    except IntegrityError:
-        conn.close()
-        return False
+    with get_conn() as conn:
+        cur = conn.cursor()
+
+        # Ensure password is unique
+        cur.execute("SELECT 1 FROM users WHERE password = %s", (password,))
+        if cur.fetchone():
+            return False
+
+        try:
+            cur.execute(
+                """
+                INSERT INTO users
+                    (fullname, email, phone, username, password, date_of_joining)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                """,
+                (fullname, email, phone, username, password, date_of_joining),
+            )
+            conn.commit()
+        except IntegrityError:
+            return False
 
-    conn.close()
     return True
 
 
@@ -101,14 +82,13 @@ def login_user(username, password):
     Returns the user row if valid and approved, "not_approved" if not approved,
     or None if invalid.
     """
-    conn = _get_conn()
-    cur  = conn.cursor()
-    cur.execute(
-        "SELECT * FROM users WHERE username = %s AND password = %s",
-        (username, password),
-    )
-    user = cur.fetchone()
-    conn.close()
+    with get_conn() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT * FROM users WHERE username = %s AND password = %s",
+            (username, password),
+        )
+        user = cur.fetchone()
 
     if user:
         approved = user[6]    # 7th column is 'approved'
@@ -125,7 +105,6 @@ def show_login_create_account():
     Renders the login, create account, and forgot password tabs.
     """
     apply_dark_theme()
-    create_tables()  # Ensure database and tables exist
 
     tabs = st.tabs(["Login", "Create Account", "Forgot Password"])
 
@@ -187,14 +166,13 @@ def show_login_create_account():
             if not forgot_email:
                 st.error("Please enter an email address.")
             else:
-                conn = _get_conn()
-                cur  = conn.cursor()
-                cur.execute(
-                    "SELECT username, password FROM users WHERE email = %s",
-                    (forgot_email,),
-                )
-                result = cur.fetchone()
-                conn.close()
+                with get_conn() as conn:
+                    cur = conn.cursor()
+                    cur.execute(
+                        "SELECT username, password FROM users WHERE email = %s",
+                        (forgot_email,),
+                    )
+                    result = cur.fetchone()
 
                 if result:
                     username, password = result
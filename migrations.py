@@ -0,0 +1,274 @@
+# migrations.py – versioned schema migrations for the course database
+"""
+Every schema change is a numbered entry in `MIGRATIONS`; applied versions
+are recorded in `schema_migrations`, so each runs exactly once per
+database and a fresh database is brought up to date in order.
+
+    python migrations.py                 # apply everything pending
+    python migrations.py --list          # show applied / pending
+    python migrations.py --to 3          # stop after version 3
+
+(database flags as for regrade.py: --host/--user/… or MYSQL_* variables,
+else `.streamlit/secrets.toml`).
+
+Rules for new entries:
+
+  • append, never edit or renumber an applied migration
+  • steps are SQL strings or `step(cur)` callables; make them safe on a
+    database that already has the change (IF NOT EXISTS, `add_column`,
+    `add_index`) – older deployments created tables by hand
+  • MySQL commits DDL implicitly, so a migration is recorded only after
+    all its steps succeeded; a failed one is retried from the top
+
+Concurrent runners serialize on a MySQL named lock.  The app itself only
+reads `schema_version()` at startup (database.check_schema); run this
+script as part of every deploy.
+"""
+import argparse
+import sys
+
+from mysql.connector import errorcode, errors
+
+from db_pool import add_db_arguments, configure_from_args, get_conn
+
+LOCK_NAME = "schema_migrations"
+LOCK_TIMEOUT = 60
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Step helpers                                                                 │
+# ──────────────────────────────────────────────────────────────────────────────
+def add_column(table, column, definition):
+    """Step: ALTER TABLE … ADD COLUMN unless the column already exists."""
+    def step(cur):
+        cur.execute(
+            "SELECT COUNT(*) FROM information_schema.columns "
+            "WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s",
+            (table, column),
+        )
+        if not cur.fetchone()[0]:
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return step
+
+
+def add_index(table, index, columns):
+    """Step: CREATE INDEX unless `table` already has an index of that name."""
+    def step(cur):
+        cur.execute(
+            "SELECT COUNT(*) FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s",
+            (table, index),
+        )
+        if not cur.fetchone()[0]:
+            cur.execute(f"CREATE INDEX {index} ON {table} ({columns})")
+    return step
+
+
+def _bootstrap_leaderboard(cur):
+    cur.execute("SELECT 1 FROM progress_summary LIMIT 1")
+    if cur.fetchone() is None:
+        from github_progress import rebuild_leaderboard
+        rebuild_leaderboard()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Migrations                                                                   │
+# ──────────────────────────────────────────────────────────────────────────────
+MIGRATIONS = [
+    (1, "base tables", [
+        # USERS
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            fullname         VARCHAR(100),
+            email            VARCHAR(100),
+            phone            BIGINT,
+            username         VARCHAR(50)  PRIMARY KEY,
+            password         VARCHAR(100),
+            date_of_joining  TIMESTAMP     NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            approved         TINYINT       DEFAULT 0
+        ) ENGINE=InnoDB
+        """,
+        # RECORDS
+        """
+        CREATE TABLE IF NOT EXISTS records (
+            username VARCHAR(50) PRIMARY KEY,
+            as1      INT DEFAULT NULL,
+            as2      INT DEFAULT NULL,
+            as3      INT DEFAULT NULL,
+            as4      INT DEFAULT NULL
+        ) ENGINE=InnoDB
+        """,
+        # GRADE CACHE (grades/cache.py, used when GRADE_CACHE_DB=1)
+        """
+        CREATE TABLE IF NOT EXISTS grade_cache (
+            cache_key   CHAR(64)    PRIMARY KEY,
+            assignment  VARCHAR(16) NOT NULL,
+            result      TEXT        NOT NULL,
+            created_at  TIMESTAMP   NOT NULL DEFAULT CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB
+        """,
+        # SUBMISSIONS (submissions.py): every attempt, contents by hash
+        """
+        CREATE TABLE IF NOT EXISTS submission_blobs (
+            sha256      CHAR(64)    PRIMARY KEY,
+            size        INT         NOT NULL,
+            codec       VARCHAR(8)  NOT NULL,
+            data        LONGBLOB    NOT NULL
+        ) ENGINE=InnoDB
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS submissions (
+            id          BIGINT      AUTO_INCREMENT PRIMARY KEY,
+            username    VARCHAR(50) NOT NULL,
+            assignment  VARCHAR(16) NOT NULL,
+            score       INT         DEFAULT NULL,
+            code_hash   CHAR(64)    NOT NULL,
+            artifacts   TEXT        NOT NULL,
+            created_at  TIMESTAMP   NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_submissions_user (username, assignment, created_at),
+            INDEX idx_submissions_assignment (assignment, username)
+        ) ENGINE=InnoDB
+        """,
+    ]),
+    (2, "progress table", [
+        # PROGRESS (github_progress.py): unlocked tabs per week
+        """
+        CREATE TABLE IF NOT EXISTS progress (
+            username    VARCHAR(50)  PRIMARY KEY,
+            fullname    VARCHAR(100),
+            week1track  INT          NOT NULL DEFAULT 1,
+            week2track  INT          NOT NULL DEFAULT 0,
+            week3track  INT          NOT NULL DEFAULT 0,
+            week4track  INT          NOT NULL DEFAULT 0,
+            week5track  INT          NOT NULL DEFAULT 0
+        ) ENGINE=InnoDB
+        """,
+        # admin.py: ORDER BY fullname, username + prefix search on fullname
+        add_index("progress", "idx_progress_fullname", "fullname, username"),
+    ]),
+    (3, "quiz scores on records", [
+        add_column("records", "quiz1", "INT DEFAULT NULL"),
+        add_column("records", "quiz2", "INT DEFAULT NULL"),
+    ]),
+    (4, "users lookup indexes", [
+        add_index("users", "idx_users_email", "email"),            # password reset
+        add_index("users", "idx_users_password", "password"),      # sign-up uniqueness check
+        add_index("users", "idx_users_approved", "approved, date_of_joining"),   # control.py
+    ]),
+    (5, "leaderboard", [
+        # LEADERBOARD (github_progress.refresh_summary): one row per progress row
+        """
+        CREATE TABLE IF NOT EXISTS progress_summary (
+            username          VARCHAR(50)  PRIMARY KEY,
+            fullname          VARCHAR(100),
+            total_tabs        INT          NOT NULL DEFAULT 0,
+            percent_complete  DECIMAL(4,1) NOT NULL DEFAULT 0,
+            updated_at        TIMESTAMP    NOT NULL DEFAULT CURRENT_TIMESTAMP
+                                           ON UPDATE CURRENT_TIMESTAMP,
+            INDEX idx_summary_total (total_tabs, fullname, username)
+        ) ENGINE=InnoDB
+        """,
+        _bootstrap_leaderboard,
+    ]),
+    # …append further migrations here…
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Runner                                                                       │
+# ──────────────────────────────────────────────────────────────────────────────
+def _ensure_version_table(cur):
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version      INT          PRIMARY KEY,
+            description  VARCHAR(200) NOT NULL,
+            applied_at   TIMESTAMP    NOT NULL DEFAULT CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB
+        """
+    )
+
+
+def schema_version(cur):
+    """Highest applied version (0 for a database never migrated) – one SELECT."""
+    try:
+        cur.execute("SELECT MAX(version) FROM schema_migrations")
+    except errors.ProgrammingError as e:
+        if e.errno == errorcode.ER_NO_SUCH_TABLE:
+            return 0
+        raise
+    return cur.fetchone()[0] or 0
+
+
+def applied_versions(cur):
+    """Set of migration versions already recorded in this database."""
+    _ensure_version_table(cur)
+    cur.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cur.fetchall()}
+
+
+def pending_migrations(cur, target=None):
+    done = applied_versions(cur)
+    return [m for m in MIGRATIONS
+            if m[0] not in done and (target is None or m[0] <= target)]
+
+
+def migrate(target=None, log=print):
+    """Apply every pending migration up to `target`; returns the versions applied."""
+    applied = []
+    with get_conn() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT GET_LOCK(%s, %s)", (LOCK_NAME, LOCK_TIMEOUT))
+        if cur.fetchone()[0] != 1:
+            raise RuntimeError(f"could not acquire the {LOCK_NAME!r} lock")
+        try:
+            for version, description, steps in pending_migrations(cur, target):
+                log(f"applying {version}: {description}")
+                for step in steps:
+                    if callable(step):
+                        step(cur)
+                    else:
+                        cur.execute(step)
+                cur.execute(
+                    "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                    (version, description),
+                )
+                conn.commit()
+                applied.append(version)
+        finally:
+            cur.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+            cur.fetchall()
+    return applied
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Command line                                                                 │
+# ──────────────────────────────────────────────────────────────────────────────
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description="Apply database schema migrations.")
+    parser.add_argument("--to", type=int, metavar="VERSION", help="stop after this version")
+    parser.add_argument("--list", action="store_true", help="show status and exit")
+    add_db_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    configure_from_args(args, pool_size=2)
+    if args.list:
+        with get_conn() as conn:
+            cur = conn.cursor()
+            done = applied_versions(cur)
+            conn.commit()
+        for version, description, _steps in MIGRATIONS:
+            print(f"{'applied' if version in done else 'pending':8} {version:3}  {description}")
+        return 0
+    applied = migrate(args.to)
+    print(f"Applied {len(applied)} migration(s)." if applied else "Schema is up to date.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,9 @@
 import streamlit as st
-from github_progress import get_user_progress, update_user_progress
+from github_progress import get_user_progress
+from week_tabs import render_week_tabs
+from update_tabs import load_update_tabs as _load_update_tabs
 from . import tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10, tab11, tab12
-import os
 import re
-import importlib.util
-
-def safe_rerun():
-    if hasattr(st, "experimental_rerun"):
-        st.experimental_rerun()
-    elif hasattr(st, "rerun"):
-        st.rerun()
-    else:
-        st.error("Streamlit rerun functionality is not available.")
 
 def parse_tab_title(title):
     """
@@ -39,29 +31,11 @@ def parse_tab_title(title):
 
 def load_update_tabs():
     """
-    Loads update tabs for Week 2 from the updates folder.
+    Loads update tabs for Week 2 from the updates folder (cached by
+    update_tabs, reloaded only when a file changes).
     Each update module should define a variable TAB_TITLE that starts with "2.".
     """
-    update_tabs = []
-    updates_folder = os.path.join(os.getcwd(), "updates")
-    if os.path.isdir(updates_folder):
-        for file in os.listdir(updates_folder):
-            if file.endswith("update.py"):
-                filepath = os.path.join(updates_folder, file)
-                # Create a sanitized module name (replace dots with underscores)
-                sanitized_module_name = file[:-3].replace('.', '_')
-                try:
-                    spec = importlib.util.spec_from_file_location(sanitized_module_name, filepath)
-                    mod = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(mod)
-                    if hasattr(mod, "show"):
-                        # Retrieve TAB_TITLE from the module.
-                        title = getattr(mod, "TAB_TITLE", None)
-                        if title and title.startswith("2."):
-                            update_tabs.append((title, mod.show))
-                except Exception as e:
-                    st.error(f"Error loading {file}: {e}")
-    return update_tabs
+    return _load_update_tabs("2.")
 
 def show():
     username = st.session_state.get("username", "default_user")
@@ -99,26 +73,7 @@ def show():
     tab_titles = [t[0] for t in all_tabs_sorted]
     tab_funcs = [t[1] for t in all_tabs_sorted]
 
-    tabs = st.tabs(tab_titles)
-
-    for i, tab in enumerate(tabs):
-        with tab:
-            if i < progress:
-                # Call the function to display content.
-                tab_funcs[i]()
-            else:
-                st.info("This tab is locked. Please complete previous tabs to unlock.")
-
-            # "Mark as Read" button on the last unlocked tab.
-            if i == progress - 1 and progress < len(tab_titles):
-                key = f"marking_week2_tab{i+1}"
-                if key not in st.session_state:
-                    st.session_state[key] = False
-                if st.button("Mark as Read", key=f"week2_tab{i+1}", disabled=st.session_state[key]):
-                    st.session_state[key] = True
-                    update_user_progress(username, week, progress + 1)
-                    st.info("Progress updated. Please click on the next tab to view the content.")
-                    safe_rerun()
+    render_week_tabs(week, tab_titles, tab_funcs, progress, username)
 
 if __name__ == "__main__":
     show()
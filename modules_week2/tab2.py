@@ -1,4 +1,5 @@
 import streamlit as st
+from assets import asset_image
 
 def show():
     st.header("2.1 Breaking Down Long Scripts and Using Google Drive with Google Colab")
@@ -8,7 +9,7 @@ def show():
         "Google Drive acts as cloud storage for these scripts, making them accessible across devices and enabling integration with Google Colab for seamless execution."
     )
     st.video("https://youtu.be/d79b7IFY6dM")
-    st.image("https://github.com/Hakari-Bibani/AprojectI/blob/main/workflow.png")
+    asset_image("workflow.png")
     st.subheader("Steps:")
     st.markdown(
         """
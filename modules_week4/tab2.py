@@ -1,4 +1,5 @@
 import streamlit as st
+from lesson_images import lesson_image
 
 def show():
     st.markdown(
@@ -6,7 +7,7 @@ def show():
         unsafe_allow_html=True,
     )
     st.write("Introduction to Advanced Data Concepts")
-    st.image("photos/4.png")
+    lesson_image("photos/4.png")
     st.write(
         """
 This module is designed for individuals who already have a foundational understanding of Python programming, can build applications using Streamlit, and are familiar with version control using GitHub. It focuses on taking your skills to the next level by exploring advanced data concepts and methodologies that enable deeper insights, better decision-making, and innovative applications.
@@ -1,10 +1,11 @@
 import streamlit as st
+from lesson_images import lesson_image
 import pandas as pd
 
 def show():
     st.markdown('<h1 style="color: palegreen;">4.2 Numerical Data</h1>', unsafe_allow_html=True)
     st.markdown("### Numerical Data")
-    st.image("photos/5.png", caption="Numerical Data")
+    lesson_image("photos/5.png", caption="Numerical Data")
     
     st.markdown("#### What is it?")
     st.write(
@@ -19,7 +20,7 @@ Numerical data refers to information that is measurable and expressed in numbers
     
     st.markdown("#### Types of Numerical Data")
     st.markdown("**1. Discrete Data:**")
-    st.image("photos/6.png", caption="Discrete Data")
+    lesson_image("photos/6.png", caption="Discrete Data")
     st.markdown("**Numerical Data: Discrete Data**")
     
     discrete_data = {
@@ -34,7 +35,7 @@ Numerical data refers to information that is measurable and expressed in numbers
     st.dataframe(df_discrete, height=200)
     
     st.markdown("**2. Continuous Data:**")
-    st.image("photos/7.png", caption="Continuous Data")
+    lesson_image("photos/7.png", caption="Continuous Data")
     st.markdown("**Numerical Data: Continuous Data**")
     
     continuous_data = {
@@ -49,7 +50,7 @@ Numerical data refers to information that is measurable and expressed in numbers
     st.dataframe(df_continuous, height=200)
     
     st.markdown("#### Why is it Important?")
-    st.image("photos/8.png", caption="Importance of Numerical Data")
+    lesson_image("photos/8.png", caption="Importance of Numerical Data")
     st.write(
         """
 Understanding and analyzing numerical data enables us to:
@@ -117,7 +118,7 @@ Date | Location | Max Temp (°C) | Min Temp (°C) | Avg Temp (°C)
     )
     
     st.markdown("#### How to Analyze Numerical Data")
-    st.image("photos/9.png", caption="Analyzing Numerical Data")
+    lesson_image("photos/9.png", caption="Analyzing Numerical Data")
     st.write(
         """
 **Basic Calculations:**
@@ -1,9 +1,10 @@
 import streamlit as st
+from lesson_images import lesson_image
 
 def show():
     st.markdown('<h1 style="color: palegreen;">4.3 Geospatial Data</h1>', unsafe_allow_html=True)
     st.markdown("### Geospatial Data")
-    st.image("photos/10.png", use_column_width=True)
+    lesson_image("photos/10.png", use_column_width=True)
     st.markdown(
         """
 **What is it?**  
@@ -18,7 +19,7 @@ Geospatial data refers to information tied to specific geographic locations, def
 1. **Geospatial Attributes**
         """, unsafe_allow_html=True
     )
-    st.image("photos/11.png", use_column_width=True)
+    lesson_image("photos/11.png", use_column_width=True)
     st.markdown(
         """
 - **Coordinates:** Define a point's location.
@@ -43,7 +44,7 @@ Geospatial data refers to information tied to specific geographic locations, def
 - Google Earth Engine, Geopandas, Folium, Plotly.
         """, unsafe_allow_html=True
     )
-    st.image("photos/12.png", use_column_width=True)
+    lesson_image("photos/12.png", use_column_width=True)
     st.markdown(
         """
 **Google Earth Engine (GEE):**  
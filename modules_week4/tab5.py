@@ -1,8 +1,9 @@
 import streamlit as st
+from lesson_images import lesson_image
 
 def show():
     st.markdown("<h1 style='color: palegreen;'>4.4 Image Data</h1>", unsafe_allow_html=True)
-    st.image("photos/13.png")
+    lesson_image("photos/13.png")
     st.markdown(
         """
 **What is it?**  
@@ -19,7 +20,7 @@ Image data represents visual content such as photographs, satellite imagery, and
 3. Medical Imaging  
         """, unsafe_allow_html=True
     )
-    st.image("photos/14.png")
+    lesson_image("photos/14.png")
     st.markdown(
         """
 1. **Environmental Monitoring:**  
@@ -35,7 +36,7 @@ Image data represents visual content such as photographs, satellite imagery, and
    - Tools: TensorFlow, PyTorch.
         """, unsafe_allow_html=True
     )
-    st.image("photos/15.png")
+    lesson_image("photos/15.png")
     st.markdown(
         """
 **Image Processing Tools:**  
@@ -44,7 +45,7 @@ Image data represents visual content such as photographs, satellite imagery, and
 3. **TensorFlow and PyTorch:** AI frameworks for image classification.
         """, unsafe_allow_html=True
     )
-    st.image("photos/16.png")
+    lesson_image("photos/16.png")
     st.markdown(
         """
 **Example Datasets and Workflow:**  
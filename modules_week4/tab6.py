@@ -1,16 +1,17 @@
 import streamlit as st
+from lesson_images import lesson_image
 
 def show():
     st.markdown("<h1 style='color: #98FB98;'>4.5 Understanding and Working with Text Data</h1>", unsafe_allow_html=True)
     st.markdown("### What is Text Data?")
-    st.image("photos/17.png")
+    lesson_image("photos/17.png")
     st.markdown(
         """
 Text data refers to any written or spoken digital content. It includes customer reviews, academic papers, and social media posts.
         """
     )
     st.markdown("### Why It Matters")
-    st.image("photos/18.png")
+    lesson_image("photos/18.png")
     st.markdown(
         """
 Text data provides insights into human sentiment, enables automation, and supports real-time decision making.
@@ -28,7 +29,7 @@ Text data provides insights into human sentiment, enables automation, and suppor
         """
     )
     st.markdown("### Key Tools and Frameworks for Text Data")
-    st.image("photos/19.png")
+    lesson_image("photos/19.png")
     st.markdown(
         """
 1. **NLTK:** Tokenization, stemming, sentiment analysis.
@@ -43,7 +44,7 @@ Text data provides insights into human sentiment, enables automation, and suppor
         """
     )
     st.markdown("### How to Work With Text Data")
-    st.image("photos/20.png")
+    lesson_image("photos/20.png")
     st.markdown(
         """
 - **Data Acquisition:** Use Kaggle, Google Dataset Search, or Twitter API.
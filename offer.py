@@ -1,4 +1,5 @@
 import streamlit as st
+from style_registry import inject_css
 
 # Helper function to safely trigger a rerun
 def safe_rerun():
@@ -9,38 +10,39 @@ def safe_rerun():
     else:
         st.error("Streamlit rerun functionality is not available. Please update Streamlit.")
 
+_OFFER_CSS = """
+/* Center the tabs */
+div[role="tablist"] {
+    justify-content: center;
+}
+/* Style the tab buttons with pale blue */
+div[role="tablist"] button {
+    color: #ADD8E6;
+}
+/* Digital font with soft shining for headers */
+.digital-header {
+    font-family: 'Digital-7', sans-serif;
+    font-size: 40px;
+    text-align: center;
+    text-shadow: 0 0 8px rgba(255, 255, 255, 0.8);
+    margin: 10px 0;
+}
+/* Style for Course Chapters text */
+.course-chapters {
+    color: #FFDAB9;
+    font-weight: bold;
+}
+/* Style for Availability text */
+.availability {
+    color: #98FB98;
+    font-weight: bold;
+}
+"""
+
+
 def show():
     # Custom CSS for styling
-    st.markdown("""
-    <style>
-    /* Center the tabs */
-    div[role="tablist"] {
-        justify-content: center;
-    }
-    /* Style the tab buttons with pale blue */
-    div[role="tablist"] button {
-        color: #ADD8E6;
-    }
-    /* Digital font with soft shining for headers */
-    .digital-header {
-        font-family: 'Digital-7', sans-serif;
-        font-size: 40px;
-        text-align: center;
-        text-shadow: 0 0 8px rgba(255, 255, 255, 0.8);
-        margin: 10px 0;
-    }
-    /* Style for Course Chapters text */
-    .course-chapters {
-        color: #FFDAB9;
-        font-weight: bold;
-    }
-    /* Style for Availability text */
-    .availability {
-        color: #98FB98;
-        font-weight: bold;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    inject_css("offer", _OFFER_CSS)
 
     # Place the headers at the top of the page
     st.markdown('<div class="digital-header">AI for Impact</div>', unsafe_allow_html=True)
@@ -1,61 +1,77 @@
+import json
+from functools import lru_cache
+from html import escape
+
 import streamlit as st
-import mysql.connector
 from mysql.connector import Error
 from streamlit.components.v1 import html
 
-# ───────────────────────────────────────────────────────────────
-# Database helper (reads credentials from [mysql] in secrets)
-# ───────────────────────────────────────────────────────────────
-
-def _get_conn():
-    cfg = st.secrets["mysql"]
-    return mysql.connector.connect(
-        host=cfg["host"],
-        port=int(cfg.get("port", 3306)),
-        user=cfg["user"],
-        password=cfg["password"],
-        database=cfg["database"],
-        autocommit=False,
-    )
+from db_pool import get_conn
+from github_progress import WEEK_TABS, percent_sql, total_sql
 
 # ───────────────────────────────────────────────────────────────
-# Progress constants  ← week 5 set to 4 tabs (was 0)
+# Progress constants  (tab counts shared with admin via github_progress)
 # ───────────────────────────────────────────────────────────────
 
-_REQUIRED_TABS = {1: 10, 2: 12, 3: 12, 4: 7, 5: 4}
-_TOTAL_REQUIRED = sum(_REQUIRED_TABS.values()) or 1
+_REQUIRED_TABS = WEEK_TABS
 
 _WEEK_COLORS = {1: "#27c93f", 2: "#0ff", 3: "#b19cd9", 4: "#ffbd2e", 5: "#f44"}
 
 # ───────────────────────────────────────────────────────────────
-# Fetch participants & progress
+# Fetch participants & progress  (ranked + paged by the leaderboard table)
 # ───────────────────────────────────────────────────────────────
 
-def _fetch_participants():
-    """Return list of dicts with full progress info + DOJ sorted by pct."""
+PAGE_SIZE = 200          # rows per SQL page / per "Load more"
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _fetch_stats():
+    """(participant count, average completion %) computed in SQL."""
+    try:
+        with get_conn() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"SELECT COUNT(*), COALESCE(AVG({percent_sql('s')}), 0) "
+                "FROM users u JOIN progress p ON p.username=u.username "
+                "LEFT JOIN progress_summary s ON s.username=p.username"
+            )
+            count, avg = cur.fetchone()
+            return int(count), float(avg)
+    except Error as e:
+        st.error(f"Database error: {getattr(e,'msg',e)}")
+        return 0, 0.0
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _fetch_page(page):
+    """Return one page of participants (dicts), sorted by pct then name."""
+    # LEFT JOIN: a user whose leaderboard refresh failed is still listed,
+    # with totals computed from their progress row.
     query = (
         "SELECT u.fullname, u.username, u.date_of_joining, "
-        "       p.week1track, p.week2track, p.week3track, p.week4track, p.week5track "
-        "FROM users u JOIN progress p ON u.username=p.username"
+        "       p.week1track, p.week2track, p.week3track, p.week4track, p.week5track, "
+        f"      ROUND({percent_sql('s')}) AS percent "
+        "FROM users u JOIN progress p ON p.username=u.username "
+        "LEFT JOIN progress_summary s ON s.username=p.username "
+        f"ORDER BY {total_sql('s')} DESC, u.fullname, u.username "
+        "LIMIT %s OFFSET %s"
     )
     rows = []
     try:
-        with _get_conn() as conn:
+        with get_conn() as conn:
             cur = conn.cursor()
-            cur.execute(query)
-            for (fullname, username, doj, w1, w2, w3, w4, w5) in cur.fetchall():
-                weeks = {1: w1 or 0, 2: w2 or 0, 3: w3 or 0, 4: w4 or 0, 5: w5 or 0}
-                percent = min(100, round(sum(weeks.values()) / _TOTAL_REQUIRED * 100))
+            cur.execute(query, (PAGE_SIZE, page * PAGE_SIZE))
+            for (fullname, username, doj, w1, w2, w3, w4, w5, percent) in cur.fetchall():
                 rows.append({
                     "fullname": fullname or username,
                     "username": username,
                     "doj": doj.strftime("%Y-%m-%d") if doj else "N/A",
-                    "percent": percent,
-                    "weeks": weeks,
+                    "percent": int(percent),
+                    "weeks": (w1 or 0, w2 or 0, w3 or 0, w4 or 0, w5 or 0),
                 })
     except Error as e:
         st.error(f"Database error: {getattr(e,'msg',e)}")
-    return sorted(rows, key=lambda r: (-r["percent"], r["fullname"]))
+    return rows
 
 # ───────────────────────────────────────────────────────────────
 # Build HTML
@@ -78,7 +94,8 @@ box-shadow:0 0 30px rgba(0,255,65,.3),inset 0 0 20px rgba(0,255,65,.1);padding:3
 .header{display:flex;align-items:center;margin-bottom:25px;padding-bottom:15px;border-bottom:1px solid var(--border);}
 .title{color:var(--cyan);font-size:1.8rem;font-weight:700;text-shadow:0 0 10px rgba(0,212,255,.4);}
 .stats{margin-left:auto;color:var(--text2);font-size:.9rem;}
-.participant{margin:0;padding:18px 0;}.divider{border-top:1px solid var(--border);}
+.viewport{height:{{VIEW_H}}px;overflow-y:auto;position:relative;}
+.participant{margin:0;padding:18px 0;height:{{ROW_H}}px;overflow:hidden;border-bottom:1px solid var(--border);}
 .p-head{display:flex;align-items:center;justify-content:space-between;margin-bottom:12px;}
 .p-name{font-size:1.05rem;font-weight:600;color:var(--yellow);}
 .p-doj{font-size:.8rem;color:var(--text2);margin-left:10px;}
@@ -87,13 +104,35 @@ box-shadow:0 0 30px rgba(0,255,65,.3),inset 0 0 20px rgba(0,255,65,.1);padding:3
 .o-bar{width:90px;height:8px;background:var(--bg3);border-radius:4px;overflow:hidden;}
 .o-prog{height:100%;background:linear-gradient(90deg,var(--green),var(--cyan));border-radius:4px;
 transition:width .8s ease;box-shadow:0 0 6px var(--glow);}
-.weeks{display:grid;grid-template-columns:repeat(auto-fit,minmax(130px,1fr));gap:8px;}
+.weeks{display:grid;grid-template-columns:repeat(5,minmax(0,1fr));gap:8px;}
 .w-item{display:flex;align-items:center;background:var(--bg2);padding:6px 10px;border-radius:6px;border-left:3px solid;}
 .w-lbl{font-weight:500;margin-right:6px;min-width:38px;font-size:.85rem;}
 .w-prog{flex:1;height:6px;background:var(--bg1);border-radius:3px;overflow:hidden;margin-right:6px;}
 .w-bar{height:100%;border-radius:3px;}.w-count{font-size:.75rem;color:var(--text2);}
 </style></head><body><div class=\"terminal\"><div class=\"header\">
-<h2 class=\"title\">⚡ Progress Dashboard</h2><div class=\"stats\">{{STATS}}</div></div>{{ROWS}}</div></body></html>"""
+<h2 class=\"title\">⚡ Progress Dashboard</h2><div class=\"stats\">{{STATS}}</div></div>
+<div class=\"viewport\" id=\"vp\"><div id=\"spacer\"><div id=\"items\"></div></div></div></div>
+<script>
+// virtual list: only the rows in (or near) view are in the DOM
+const ROWS = {{ROWS}}, H = {{ROW_H}}, BUF = 6;
+const vp = document.getElementById("vp"), items = document.getElementById("items");
+document.getElementById("spacer").style.height = (ROWS.length * H) + "px";
+let first = -1, queued = false;
+function draw() {
+  queued = false;
+  const start = Math.max(0, Math.floor(vp.scrollTop / H) - BUF);
+  if (start === first) return;
+  first = start;
+  items.style.transform = "translateY(" + (start * H) + "px)";
+  items.innerHTML = ROWS.slice(start, start + Math.ceil(vp.clientHeight / H) + 2 * BUF).join("");
+}
+vp.addEventListener("scroll", () => { if (!queued) { queued = true; requestAnimationFrame(draw); } }, {passive: true});
+draw();
+</script></body></html>"""
+
+ROW_H = 118              # px per participant row (fixed, for the virtual list)
+VIEW_H = 620             # px of scrollable list
+
 
 def _week_bar(w, done):
     req = _REQUIRED_TABS.get(w, 1) or 1
@@ -104,34 +143,48 @@ def _week_bar(w, done):
             f'<div class="w-prog"><div class="w-bar" style="background:{color};width:{pct}%;"></div></div>'
             f'<span class="w-count">{done}/{req}</span></div>')
 
-def _build_rows(parts):
+
+@lru_cache(maxsize=8192)
+def _row_html(fullname, doj, percent, weeks):
+    """One participant's fragment; cached on (name, doj, progress values)."""
+    weeks_html = "".join(_week_bar(w, c) for w, c in zip(_REQUIRED_TABS, weeks) if _REQUIRED_TABS[w])
+    return (
+        f'<div class="participant">'
+        f'<div class="p-head"><span class="p-name">{escape(fullname)}</span>'
+        f'<span class="p-doj">({doj})</span>'
+        f'<div class="badge"><span class="pct">{percent}%</span>'
+        f'<div class="o-bar"><div class="o-prog" style="width:{percent}%"></div></div></div></div>'
+        f'<div class="weeks">{weeks_html}</div>'
+        f'</div>'
+    )
+
+
+def _build_rows(parts, count, avg):
     if not parts:
         return "<p class='no-data'>No participants found.</p>"
-    stats = f"👥 {len(parts)} participants | 📊 {sum(p['percent'] for p in parts)/len(parts):.1f}% avg completion"
-    rows_html = []
-    for p in parts:
-        weeks_html = "".join(_week_bar(w, c) for w, c in p["weeks"].items() if _REQUIRED_TABS[w])
-        rows_html.append(
-            f'<div class="participant">'
-            f'<div class="p-head"><span class="p-name">{p["fullname"]}</span>'
-            f'<span class="p-doj">({p["doj"]})</span>'
-            f'<div class="badge"><span class="pct">{p["percent"]}%</span>'
-            f'<div class="o-bar"><div class="o-prog" style="width:{p["percent"]}%"></div></div></div></div>'
-            f'<div class="weeks">{weeks_html}</div>'
-            f'</div><div class="divider"></div>'
-        )
-    html_out = _HTML_TEMPLATE.replace("{{STATS}}", stats).replace("{{ROWS}}", "\n".join(rows_html))
-    return html_out
+    stats = f"👥 {count} participants | 📊 {avg:.1f}% avg completion"
+    fragments = [_row_html(p["fullname"], p["doj"], p["percent"], p["weeks"]) for p in parts]
+    data = json.dumps(fragments).replace("</", "<\\/")      # keep "</script>" out of the JSON
+    return (_HTML_TEMPLATE.replace("{{STATS}}", stats).replace("{{ROWS}}", data)
+            .replace("{{ROW_H}}", str(ROW_H)).replace("{{VIEW_H}}", str(VIEW_H)))
 
 # ───────────────────────────────────────────────────────────────
 # Streamlit entrypoint
 # ───────────────────────────────────────────────────────────────
 
+def _load_more():
+    st.session_state["participants_pages"] += 1
+
+
 def show():
     st.set_page_config(page_title="Participants", layout="wide")
-    parts = _fetch_participants()
-    html_content = _build_rows(parts)
-    html(html_content, height=min(900, 320 + len(parts) * 70), scrolling=True)
+    count, avg = _fetch_stats()
+    pages = st.session_state.setdefault("participants_pages", 1)
+    parts = [p for page in range(pages) for p in _fetch_page(page)]
+    html(_build_rows(parts, count, avg), height=VIEW_H + 160)
+    if len(parts) < count:
+        st.caption(f"Showing the top {len(parts)} of {count}.")
+        st.button("Load more", on_click=_load_more)
 
 if __name__ == "__main__":
     show()
@@ -1,7 +1,8 @@
 # quiz1.py – MySQL edition with selectbox answers
 import streamlit as st
-import mysql.connector
-from mysql.connector import errorcode
+from style_registry import inject_css
+
+from db_pool import get_conn
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Optional GitHub-push stub
@@ -13,20 +14,6 @@ except ModuleNotFoundError:
         """No-op – data already lives in MySQL."""
         return {"success": True}
 
-# ──────────────────────────────────────────────────────────────────────────────
-# MySQL connection helper
-# ──────────────────────────────────────────────────────────────────────────────
-def _get_conn():
-    cfg = st.secrets["mysql"]
-    return mysql.connector.connect(
-        host=cfg["host"],
-        port=int(cfg.get("port", 3306)),
-        user=cfg["user"],
-        password=cfg["password"],
-        database=cfg["database"],
-        autocommit=False,
-    )
-
 # ──────────────────────────────────────────────────────────────────────────────
 # Quiz questions
 # ──────────────────────────────────────────────────────────────────────────────
@@ -114,59 +101,61 @@ MAX_ATTEMPTS = 1
 # ──────────────────────────────────────────────────────────────────────────────
 # Helpers
 # ──────────────────────────────────────────────────────────────────────────────
+_QUIZ_CSS = """
+.question-container {
+    background-color: #0E1117;
+    border-radius: 10px;
+    padding: 15px;
+    margin-bottom: 20px;
+    border: 1px solid #2D3748;
+}
+.question-text {
+    font-size: 16px;
+    font-weight: bold;
+    margin-bottom: 15px;
+    color: #FFD700;
+}
+/* Selectbox styling */
+div[data-baseweb="select"] > div {
+    background-color: #1E293B !important;
+    color: white !important;
+    border-color: #4A5568 !important;
+}
+div[data-baseweb="popover"] {
+    background-color: #1E293B !important;
+}
+div[data-baseweb="menu"] li {
+    background-color: #1E293B !important;
+    color: white !important;
+}
+div[data-baseweb="menu"] li:hover {
+    background-color: #2D3748 !important;
+}
+/* Button styling */
+.stButton>button {
+    background-color: #2563EB;
+    color: white;
+    border: none;
+    padding: 10px 24px;
+    border-radius: 6px;
+    font-weight: bold;
+}
+.stButton>button:hover {
+    background-color: #1D4ED8;
+}
+"""
+
+
 def add_custom_css():
-    st.markdown("""<style>
-        .question-container {
-            background-color: #0E1117;
-            border-radius: 10px;
-            padding: 15px;
-            margin-bottom: 20px;
-            border: 1px solid #2D3748;
-        }
-        .question-text {
-            font-size: 16px;
-            font-weight: bold;
-            margin-bottom: 15px;
-            color: #FFD700;
-        }
-        /* Selectbox styling */
-        div[data-baseweb="select"] > div {
-            background-color: #1E293B !important;
-            color: white !important;
-            border-color: #4A5568 !important;
-        }
-        div[data-baseweb="popover"] {
-            background-color: #1E293B !important;
-        }
-        div[data-baseweb="menu"] li {
-            background-color: #1E293B !important;
-            color: white !important;
-        }
-        div[data-baseweb="menu"] li:hover {
-            background-color: #2D3748 !important;
-        }
-        /* Button styling */
-        .stButton>button {
-            background-color: #2563EB;
-            color: white;
-            border: none;
-            padding: 10px 24px;
-            border-radius: 6px;
-            font-weight: bold;
-        }
-        .stButton>button:hover {
-            background-color: #1D4ED8;
-        }
-    </style>""", unsafe_allow_html=True)
+    inject_css("quiz1", _QUIZ_CSS)
 
 def validate_username(username):
     """Check if username exists and hasn't submitted quiz yet."""
     try:
-        conn = _get_conn()
-        cur = conn.cursor()
-        cur.execute("SELECT quiz1 FROM records WHERE username = %s", (username,))
-        row = cur.fetchone()
-        conn.close()
+        with get_conn() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT quiz1 FROM records WHERE username = %s", (username,))
+            row = cur.fetchone()
         if row is None:
             return False, False
         return True, row[0] is not None
@@ -250,19 +239,20 @@ def show():
 
             # Store grade in MySQL
             try:
-                conn = _get_conn()
-                cur = conn.cursor()
-                cur.execute(
-                    "UPDATE records SET quiz1 = %s WHERE username = %s",
-                    (score, st.session_state["username_q1"]),
-                )
-                conn.commit()
-                if cur.rowcount == 0:
+                with get_conn() as conn:
+                    cur = conn.cursor()
+                    cur.execute(
+                        "UPDATE records SET quiz1 = %s WHERE username = %s",
+                        (score, st.session_state["username_q1"]),
+                    )
+                    conn.commit()
+                    updated = cur.rowcount
+
+                if updated == 0:
                     st.error("Grade update failed – user not found.")
                 else:
                     st.success("Grade successfully saved.")
                     push_db_to_github(None)  # no-op
-                conn.close()
             except Exception as e:
                 st.error(f"Error saving grade: {e}")
 
@@ -1,7 +1,8 @@
 # quiz2.py  – MySQL edition (no local .db file)
 import streamlit as st
-import mysql.connector
-from mysql.connector import errorcode
+from style_registry import inject_css
+
+from db_pool import get_conn
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Optional GitHub-push stub (keeps call-sites alive after file removal)
@@ -13,20 +14,6 @@ except ModuleNotFoundError:
         """No-op – data already lives in MySQL."""
         return {"success": True}
 
-# ──────────────────────────────────────────────────────────────────────────────
-# MySQL connection helper
-# ──────────────────────────────────────────────────────────────────────────────
-def _get_conn():
-    cfg = st.secrets["mysql"]
-    return mysql.connector.connect(
-        host     = cfg["host"],
-        port     = int(cfg.get("port", 3306)),
-        user     = cfg["user"],
-        password = cfg["password"],
-        database = cfg["database"],
-        autocommit = False,
-    )
-
 # ──────────────────────────────────────────────────────────────────────────────
 # Quiz questions (unchanged)
 # ──────────────────────────────────────────────────────────────────────────────
@@ -52,10 +39,13 @@ MAX_ATTEMPTS = 1
 # ──────────────────────────────────────────────────────────────────────────────
 # Helpers
 # ──────────────────────────────────────────────────────────────────────────────
+_QUIZ_CSS = """
+/* (CSS block unchanged) */
+"""
+
+
 def add_custom_css():
-    st.markdown("""<style>
-        /* (CSS block unchanged) */
-    </style>""", unsafe_allow_html=True)
+    inject_css("quiz2", _QUIZ_CSS)
 
 
 def validate_username(username):
@@ -63,11 +53,10 @@ def validate_username(username):
     Return (is_valid, quiz_submitted) using MySQL.
     """
     try:
-        conn = _get_conn()
-        cur  = conn.cursor()
-        cur.execute("SELECT quiz2 FROM records WHERE username = %s", (username,))
-        row = cur.fetchone()
-        conn.close()
+        with get_conn() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT quiz2 FROM records WHERE username = %s", (username,))
+            row = cur.fetchone()
         if row is None:
             return False, False
         return True, row[0] is not None
@@ -146,15 +135,14 @@ def show():
 
             # Store grade in MySQL
             try:
-                conn = _get_conn()
-                cur  = conn.cursor()
-                cur.execute(
-                    "UPDATE records SET quiz2 = %s WHERE username = %s",
-                    (score, st.session_state["username_q2"]),
-                )
-                conn.commit()
-                rows = cur.rowcount
-                conn.close()
+                with get_conn() as conn:
+                    cur = conn.cursor()
+                    cur.execute(
+                        "UPDATE records SET quiz2 = %s WHERE username = %s",
+                        (score, st.session_state["username_q2"]),
+                    )
+                    conn.commit()
+                    rows = cur.rowcount
 
                 if rows == 0:
                     st.error("Grade update failed – user not found.")
@@ -0,0 +1,253 @@
+# regrade.py – batch regrader: re-run the current rubrics over stored submissions
+"""
+Re-grade every stored submission with the rubric as it is *now* (after an
+edit to grades/gradeN.py, say) and write changed scores back to
+`records.as1` … `records.as4`.
+
+    python regrade.py --assignment as2 --assignment as3
+    python regrade.py --dry-run                       # report only
+
+By default each user's recorded attempt is read from the submission store
+(submissions.py): the newest one that reached the pass mark, i.e. the one
+whose grade the assignment page wrote to `records`.  A directory export
+can be given instead:
+
+    python regrade.py --from-dir submissions/
+
+        submissions/<asN>/<username>/code.py
+        submissions/<asN>/<username>/<artifact>   (names: grades.batch.ARTIFACTS)
+
+Grading fans out over a pool of sandboxed worker processes (one per CPU
+core by default, see grades/sandbox.py).  Scores are written back in
+batched transactions of `--batch-size` rows; only rows whose score
+changed are touched.  Like the assignment pages, scores below the pass
+mark (`--min-score`, default 70) are reported but not written.  A score
+is never lowered unless `--allow-lower` is given; without it, drops are
+reported and the stored grade is kept.
+
+Database
+--------
+Connection settings come from --host/--port/--user/--password/--database,
+else the MYSQL_HOST … MYSQL_DATABASE environment variables, else the
+`[mysql]` block of .streamlit/secrets.toml.  Any MySQL-compatible server
+works, so the script runs offline against a local stand-in, e.g.
+
+    docker run -d -p 3306:3306 -e MYSQL_ROOT_PASSWORD=pw \\
+               -e MYSQL_DATABASE=course mysql:8
+    python regrade.py --host 127.0.0.1 --user root --password pw \\
+               --database course
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import as_completed
+from decimal import ROUND_HALF_UP, Decimal
+
+from grades.batch import ARTIFACTS, ASSIGNMENTS
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Submissions                                                                  │
+# ──────────────────────────────────────────────────────────────────────────────
+def load_stored_submissions(assignments, min_score):
+    """Return the attempt behind each user's recorded score, per assignment."""
+    from submissions import latest_submissions
+    return [sub for assignment in assignments
+            for sub in latest_submissions(assignment, min_score=min_score)]
+
+
+def load_submissions(root, assignments):
+    """Return [{assignment, username, code, artifacts}] from a directory export."""
+    submissions = []
+    for assignment in assignments:
+        folder = os.path.join(root, assignment)
+        if not os.path.isdir(folder):
+            continue
+        for username in sorted(os.listdir(folder)):
+            user_dir = os.path.join(folder, username)
+            code_path = os.path.join(user_dir, "code.py")
+            if not os.path.isfile(code_path):
+                continue
+            with open(code_path, encoding="utf-8") as f:
+                code = f.read()
+            artifacts = {}
+            for name in ARTIFACTS[assignment]:
+                path = os.path.join(user_dir, name)
+                if os.path.isfile(path):
+                    with open(path, "rb") as f:
+                        artifacts[name] = f.read()
+            submissions.append({"assignment": assignment, "username": username,
+                                "code": code, "artifacts": artifacts})
+    return submissions
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Database                                                                     │
+# ──────────────────────────────────────────────────────────────────────────────
+def fetch_scores(assignment, usernames, chunk=500):
+    """Return {username: current score} for users that have a `records` row."""
+    from db_pool import get_conn
+    scores = {}
+    usernames = list(usernames)
+    with get_conn() as conn:
+        cur = conn.cursor()
+        for i in range(0, len(usernames), chunk):
+            part = usernames[i:i + chunk]
+            marks = ", ".join(["%s"] * len(part))
+            cur.execute(
+                f"SELECT username, {assignment} FROM records WHERE username IN ({marks})",
+                part,
+            )
+            scores.update(cur.fetchall())
+    return scores
+
+
+def stored_score(value):
+    """
+    The INT MySQL keeps for a grade: the pages write floats such as
+    `round(total, 2)` and MySQL rounds them half away from zero (the
+    connector sends them as exact decimal literals), not truncates.
+    `float()` first: numpy scalars repr as `np.float64(…)`.
+    """
+    return int(Decimal(repr(float(value))).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def write_scores(assignment, rows, batch_size):
+    """UPDATE records.<assignment> for [(score, username)], one commit per batch."""
+    from db_pool import get_conn
+    with get_conn() as conn:
+        cur = conn.cursor()
+        for i in range(0, len(rows), batch_size):
+            cur.executemany(
+                f"UPDATE records SET {assignment} = %s WHERE username = %s",
+                rows[i:i + batch_size],
+            )
+            conn.commit()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Grading                                                                      │
+# ──────────────────────────────────────────────────────────────────────────────
+def grade_all(pool, submissions, log=print):
+    """Grade every submission in the pool; returns results in input order."""
+    futures = {
+        pool.submit("grades.batch:grade_submission",
+                    s["assignment"], s["code"], s["artifacts"]): i
+        for i, s in enumerate(submissions)
+    }
+    results = [None] * len(submissions)
+    for done, future in enumerate(as_completed(futures), 1):
+        results[futures[future]] = future.result()
+        if done % 50 == 0 or done == len(submissions):
+            log(f"  graded {done}/{len(submissions)}")
+    return results
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description="Re-grade stored submissions.")
+    parser.add_argument("--from-dir", metavar="DIR",
+                        help="read a directory export instead of the submission store")
+    parser.add_argument("--assignment", action="append", choices=ASSIGNMENTS,
+                        help="assignment to regrade (repeatable; default: all)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="report score changes without writing them")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--timeout", type=float, default=60,
+                        help="wall-clock seconds per submission")
+    parser.add_argument("--batch-size", type=int, default=500,
+                        help="rows per UPDATE transaction")
+    parser.add_argument("--min-score", type=int, default=70,
+                        help="pass mark; lower scores are not written")
+    parser.add_argument("--allow-lower", action="store_true",
+                        help="also write scores lower than the stored ones")
+    from db_pool import add_db_arguments
+    add_db_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    assignments = args.assignment or list(ASSIGNMENTS)
+    from db_pool import configure_from_args
+    configure_from_args(args)
+
+    if args.from_dir:
+        submissions = load_submissions(args.from_dir, assignments)
+    else:
+        submissions = load_stored_submissions(assignments, args.min_score)
+    if not submissions:
+        print("No submissions found.")
+        return 0
+    print(f"Regrading {len(submissions)} submissions with {args.workers} workers…")
+
+    from grades.sandbox import GradingPool
+    pool = GradingPool(workers=args.workers, wall_timeout=args.timeout,
+                       cpu_timeout=int(args.timeout), preload=("pandas",))
+    t0 = time.perf_counter()
+    try:
+        results = grade_all(pool, submissions)
+    finally:
+        pool.shutdown()
+    elapsed = time.perf_counter() - t0
+
+    errors, below_pass, no_record, kept = [], [], [], []
+    exit_code = 0
+    for assignment in assignments:
+        subs = [(s, r) for s, r in zip(submissions, results) if s["assignment"] == assignment]
+        if not subs:
+            continue
+        current = fetch_scores(assignment, [s["username"] for s, _ in subs])
+
+        updates, raised, lowered = [], 0, 0
+        for sub, result in subs:
+            username = sub["username"]
+            if not result["ok"]:
+                errors.append((assignment, username, result["error"]))
+                continue
+            raw = result["value"]
+            new = stored_score(raw)
+            if username not in current:
+                no_record.append((assignment, username))
+                continue
+            old = current[username]
+            if raw < args.min_score:                 # the pages compare unrounded
+                below_pass.append((assignment, username, old, raw))
+                continue
+            if old == new:
+                continue
+            if old is not None and new < old:
+                if not args.allow_lower:
+                    kept.append((assignment, username, old, new))
+                    continue
+                lowered += 1
+            else:
+                raised += 1
+            updates.append((new, username))
+            print(f"  {assignment}  {username:<20} {old if old is not None else '—':>4} → {new}")
+
+        if updates and not args.dry_run:
+            write_scores(assignment, updates, args.batch_size)
+        print(f"{assignment}: {len(subs)} graded, {len(updates)} changed "
+              f"({raised} up, {lowered} down)"
+              f"{' – dry run, nothing written' if args.dry_run and updates else ''}")
+
+    for assignment, username, old, new in below_pass:
+        print(f"  below pass mark, kept {old}: {assignment} {username} → {new}")
+    for assignment, username, old, new in kept:
+        print(f"  lower score not written (--allow-lower), kept {old}: "
+              f"{assignment} {username} → {new}")
+    for assignment, username in no_record:
+        print(f"  no records row: {assignment} {username}")
+    for assignment, username, error in errors:
+        print(f"  FAILED {assignment} {username}: {error}")
+        exit_code = 1
+
+    rate = len(submissions) / elapsed if elapsed else float("inf")
+    print(f"Graded {len(submissions)} submissions in {elapsed:.1f} s "
+          f"({rate:.1f}/s, {args.workers} workers); {len(errors)} failed.")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,37 +1,37 @@
 import streamlit as st
+from style_registry import inject_css
+from assets import asset_image
+
+_SIDEBAR_CSS = """
+.streamlit-expanderHeader {
+    background-color: #f0f2f6;
+    border-radius: 5px;
+    margin-bottom: 0.5rem;
+}
+.stButton button {
+    background-color: transparent;
+    border: 1px solid #4ECDC4;
+    color: #4ECDC4;
+    transition: all 0.3s ease;
+}
+.stButton button:hover {
+    background-color: #4ECDC4;
+    color: white;
+    transform: translateY(-2px);
+}
+"""
+
 
 def show_sidebar():
     # ────────────────────────────────────────────────────────────────────────────
     # Any CSS tweaks here—this will not hide or collapse the sidebar itself.
     # ────────────────────────────────────────────────────────────────────────────
-    st.markdown(
-        """
-        <style>
-        .streamlit-expanderHeader {
-            background-color: #f0f2f6;
-            border-radius: 5px;
-            margin-bottom: 0.5rem;
-        }
-        .stButton button {
-            background-color: transparent;
-            border: 1px solid #4ECDC4;
-            color: #4ECDC4;
-            transition: all 0.3s ease;
-        }
-        .stButton button:hover {
-            background-color: #4ECDC4;
-            color: white;
-            transform: translateY(-2px);
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    inject_css("sidebar", _SIDEBAR_CSS)
 
     # ────────────────────────────────────────────────────────────────────────────
     # Explicitly use st.sidebar.* calls so Streamlit knows these widgets belong there
     # ────────────────────────────────────────────────────────────────────────────
-    st.sidebar.image("logo.jpg", use_container_width=True)
+    asset_image("logo.jpg", container=st.sidebar, use_container_width=True)
 
     # Home
     if st.sidebar.expander("🏠 HOME", expanded=False).button("Home Page", key="home", use_container_width=True):
@@ -0,0 +1,69 @@
+# style_registry.py – minified, content-hashed CSS injected once per render
+"""
+Styles used to be pushed as raw `<style>` markdown by every module that
+wanted them: the full dark theme went out three times per rerun after
+login (app.main, login, home), plus the sidebar, page and quiz blocks –
+comments, indentation and all.
+
+    from style_registry import inject_css
+
+    inject_css("theme", DARK_THEME_CSS)
+
+  • each CSS string is minified and hashed once per process
+  • `inject_css()` emits a bundle at most once per script run, however
+    many code paths ask for it; identical CSS under two names is one
+    bundle
+  • the `<style>` tag carries `data-css="<name>-<hash>"` for debugging
+
+`app.main()` calls `begin_render()` at the top of every run; outside a
+tracked run (a module executed on its own) every call injects.
+"""
+import hashlib
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+import streamlit as st
+
+_STATE_KEY = "_css_injected"
+
+CssBundle = namedtuple("CssBundle", "name css digest")
+
+
+@lru_cache(maxsize=None)
+def minify_css(css):
+    """Strip comments and redundant whitespace (safe subset, no rewriting)."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r"(?<=[{;])([-\w]+):\s+", r"\1:", css)    # "prop: value" → "prop:value"
+    css = css.replace(";}", "}")
+    return css.strip()
+
+
+@lru_cache(maxsize=None)
+def css_bundle(name, css):
+    """Minified, hashed bundle for `css` (memoized per distinct input)."""
+    minified = minify_css(css)
+    return CssBundle(name, minified, hashlib.sha256(minified.encode("utf-8")).hexdigest()[:12])
+
+
+def begin_render():
+    """Start a new script run: every bundle may be injected once again."""
+    st.session_state[_STATE_KEY] = set()
+
+
+def inject_css(name, css):
+    """Inject `css` unless an identical bundle was already sent this run."""
+    bundle = css_bundle(name, css)
+    if not bundle.css:
+        return
+    injected = st.session_state.get(_STATE_KEY)
+    if injected is not None:
+        if bundle.digest in injected:
+            return
+        injected.add(bundle.digest)
+    st.markdown(
+        f'<style data-css="{bundle.name}-{bundle.digest}">{bundle.css}</style>',
+        unsafe_allow_html=True,
+    )
@@ -0,0 +1,184 @@
+# submissions.py – content-addressed store of every assignment attempt
+"""
+Only the final score used to reach `records.asN`; the code and uploads
+behind it were thrown away.  Every attempt is now kept:
+
+  submissions       one row per attempt: username, assignment, score and
+                    the hashes of its code and artifacts
+                    (indexed by username/assignment and assignment/username)
+  submission_blobs  the contents, keyed by SHA-256, zlib-compressed
+
+Blobs are deduplicated by hash, so the tenth resubmission of the same
+CSV or the same code costs one small `submissions` row, not another
+copy.  Already-compressed formats (PNG, XLSX) are stored raw when zlib
+does not shrink them.
+
+    from submissions import save_submission, latest_submissions
+
+    save_submission(username, "as2", code, {"map.html": html_bytes}, score=84)
+    for sub in latest_submissions("as2"):
+        sub["username"], sub["code"], sub["artifacts"]["map.html"]
+
+Tables are created by migrations.py.
+"""
+import hashlib
+import json
+import logging
+import zlib
+
+from db_pool import get_conn
+
+_MIN_SAVING = 0.9            # keep zlib output only if ≤ 90 % of the original
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Blobs                                                                        │
+# ──────────────────────────────────────────────────────────────────────────────
+def _as_bytes(data):
+    return data.encode("utf-8") if isinstance(data, str) else bytes(data)
+
+
+def _pack(data):
+    packed = zlib.compress(data, 6)
+    if len(packed) <= len(data) * _MIN_SAVING:
+        return "zlib", packed
+    return "raw", data
+
+
+def _unpack(codec, data):
+    return zlib.decompress(data) if codec == "zlib" else bytes(data)
+
+
+def _put_blobs(cur, blobs):
+    """Insert the {sha256: bytes} blobs that are not stored yet."""
+    if not blobs:
+        return
+    hashes = list(blobs)
+    marks = ", ".join(["%s"] * len(hashes))
+    cur.execute(f"SELECT sha256 FROM submission_blobs WHERE sha256 IN ({marks})", hashes)
+    present = {row[0] for row in cur.fetchall()}
+    rows = []
+    for sha, data in blobs.items():
+        if sha not in present:
+            codec, packed = _pack(data)
+            rows.append((sha, len(data), codec, packed))
+    if rows:
+        cur.executemany(
+            "INSERT IGNORE INTO submission_blobs (sha256, size, codec, data) "
+            "VALUES (%s, %s, %s, %s)",
+            rows,
+        )
+
+
+def _get_blobs(cur, hashes):
+    """Return {sha256: bytes} for `hashes`."""
+    hashes = list(set(hashes))
+    if not hashes:
+        return {}
+    marks = ", ".join(["%s"] * len(hashes))
+    cur.execute(
+        f"SELECT sha256, codec, data FROM submission_blobs WHERE sha256 IN ({marks})",
+        hashes,
+    )
+    return {sha: _unpack(codec, data) for sha, codec, data in cur.fetchall()}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Submissions                                                                  │
+# ──────────────────────────────────────────────────────────────────────────────
+def save_submission(username, assignment, code, artifacts=None, score=None):
+    """
+    Store one attempt.  `artifacts` maps names ("map.html", …) to bytes or
+    text.  Returns the new submission id.
+    """
+    blobs = {}
+
+    def _ref(data):
+        data = _as_bytes(data)
+        sha = hashlib.sha256(data).hexdigest()
+        blobs[sha] = data
+        return sha
+
+    code_hash = _ref(code or "")
+    artifact_refs = {name: _ref(data) for name, data in (artifacts or {}).items()}
+
+    with get_conn() as conn:
+        cur = conn.cursor()
+        _put_blobs(cur, blobs)
+        cur.execute(
+            "INSERT INTO submissions (username, assignment, score, code_hash, artifacts) "
+            "VALUES (%s, %s, %s, %s, %s)",
+            (username, assignment, score, code_hash, json.dumps(artifact_refs, sort_keys=True)),
+        )
+        conn.commit()
+        return cur.lastrowid
+
+
+def record_attempt(username, assignment, code, artifacts=None, score=None):
+    """`save_submission()` for the assignment pages: never blocks grading."""
+    try:
+        return save_submission(username, assignment, code, artifacts, score)
+    except Exception:
+        logging.getLogger(__name__).warning(
+            "Could not store %s submission for %s", assignment, username, exc_info=True)
+        return None
+
+
+def _hydrate(cur, rows):
+    """Turn submission rows into dicts with code/artifact contents loaded."""
+    refs = [json.loads(r[6]) for r in rows]
+    blobs = _get_blobs(cur, [r[5] for r in rows] + [h for ref in refs for h in ref.values()])
+    return [
+        {
+            "id": sub_id,
+            "username": username,
+            "assignment": assignment,
+            "score": score,
+            "created_at": created_at,
+            "code": blobs.get(code_hash, b"").decode("utf-8", "replace"),
+            "artifacts": {name: blobs.get(sha, b"") for name, sha in ref.items()},
+        }
+        for (sub_id, username, assignment, score, created_at, code_hash, _), ref in zip(rows, refs)
+    ]
+
+
+_COLUMNS = "id, username, assignment, score, created_at, code_hash, artifacts"
+
+
+def list_submissions(username, assignment=None, limit=50):
+    """Most recent attempts of `username` (optionally for one assignment)."""
+    where, params = "username = %s", [username]
+    if assignment:
+        where += " AND assignment = %s"
+        params.append(assignment)
+    with get_conn() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            f"SELECT {_COLUMNS} FROM submissions WHERE {where} "
+            "ORDER BY created_at DESC, id DESC LIMIT %s",
+            params + [int(limit)],
+        )
+        return _hydrate(cur, cur.fetchall())
+
+
+def latest_submissions(assignment, min_score=None):
+    """
+    The newest attempt of every user for `assignment`, ordered by username.
+    With `min_score`, the newest attempt that scored at least that much –
+    the one whose grade the pages wrote to `records` (they only write
+    passing grades).
+    """
+    where, params = "assignment = %s", [assignment]
+    if min_score is not None:
+        where += " AND score >= %s"
+        params.append(min_score)
+    with get_conn() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            f"SELECT {_COLUMNS} FROM submissions "
+            f"WHERE id IN (SELECT MAX(id) FROM submissions WHERE {where} "
+            "             GROUP BY username) "
+            "ORDER BY username",
+            params,
+        )
+        return _hydrate(cur, cur.fetchall())
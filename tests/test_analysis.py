@@ -0,0 +1,86 @@
+# tests/test_analysis.py – the shared code-quality feature index (grades/analysis.py)
+import pytest
+
+from grades.analysis import CodeFeatures, analyze
+
+
+@pytest.mark.parametrize("code, issues", [
+    ("x = 1\n", 0),
+    ("x=1\n", 1),
+    ("f(a=1)\n", 0),                 # keyword argument
+    ("def f(a=1):\n    pass\n", 0),  # default value
+    ("y = -1\n", 0),                 # unary minus
+    ("f(-1, *args)\n", 0),
+    ("y = z[i+1]\n", 1),
+    ("y = z[i + 1]\n", 0),
+    ("f = lambda v=1: v\n", 0),     # lambda default
+    ("f = lambda v: v==1\n", 1),
+])
+def test_spacing_issues(code, issues):
+    assert CodeFeatures(code).spacing_issues == issues
+
+
+def test_import_aliases_resolve_calls():
+    f = CodeFeatures(
+        "import pandas as pd\n"
+        "from geopy.distance import geodesic\n"
+        "df = pd.read_csv('a.csv')\n"
+        "d = geodesic((0, 0), (1, 1)).km\n"
+    )
+    assert f.imports_module("pandas")
+    assert f.imports_module("geopy")
+    assert f.imported_names >= {"pd", "geodesic"}
+    assert f.called("pandas.read_csv")
+    assert f.called("geopy.distance.geodesic")
+    assert not f.called("pd.read_csv")
+
+
+def test_loop_variables_are_not_single_letter_names():
+    f = CodeFeatures(
+        "for i in range(3):\n"
+        "    total = i\n"
+        "squares = [k * k for k in range(3)]\n"
+        "x = 1\n"
+    )
+    assert f.loop_names == {"i", "k"}
+    assert f.single_letter_names == {"x"}
+
+
+def test_subscript_and_attribute_targets_bind_no_names():
+    f = CodeFeatures(
+        "counter = {}\n"
+        "for word in words:\n"
+        "    k = word.lower()\n"
+        "    data[idx] = k\n"
+        "    counter[k] = 1\n"
+        "obj.x = 2\n"
+        "first, *rest = words\n"
+    )
+    assert f.assigned_names == {"counter", "k", "first", "rest"}
+    assert f.single_letter_names == {"k"}
+
+
+def test_substrings_do_not_count():
+    f = CodeFeatures("url = 'https://example.com/#x'\nm = max(1, 2)\n")
+    assert f.comment_count == 0
+    assert f.called("max") and not f.called("x")
+
+
+def test_unparseable_code_falls_back_to_lines():
+    f = CodeFeatures(
+        "import folium\n"
+        "# map of stops\n"
+        "m = folium.Map(location=[0, 0]\n"
+        "def show(:\n"
+    )
+    assert not f.parsed
+    assert f.imports_module("folium")
+    assert f.called("folium.Map")
+    assert "location" in f.keywords
+    assert "m" in f.assigned_names
+    assert f.comment_count == 1
+
+
+def test_analyze_is_memoized():
+    assert analyze("x = 1\n") is analyze("x = 1\n")
+    assert analyze(None).parsed
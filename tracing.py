@@ -0,0 +1,212 @@
+# tracing.py – structured spans written to a local OTLP-JSON file
+"""
+The `[SQL] 12.3 ms SELECT` log lines say how long one statement took, but
+not which page, lesson or grading step issued it.  Spans do:
+
+    from tracing import span, traced
+
+    with span("tab.render", week=3, tab=4):
+        ...
+
+    @traced("grade.evaluate")
+    def grade(...): ...
+
+  • spans nest per thread; the outermost one (usually `request`, one
+    Streamlit script run) starts a trace
+  • when a root span ends its whole trace is appended to TRACE_FILE as
+    one line of OTLP/JSON (`ExportTraceServiceRequest`, the format of the
+    OpenTelemetry collector's file exporter) – load it with any OTLP
+    tool, or just `jq`
+  • an exception inside a span marks it ERROR (and is re-raised)
+
+Instrumented so far: request / page dispatch (app.py), week routing,
+tab renders (week_tabs.py), every SQL statement with normalized text
+and row count (app.py's patch of both the pure-Python and C-extension
+cursors), grading phases (grades/cache.py,
+grades/analysis.py, grades/sandbox.py) and asset loads (assets.py,
+lesson_images.py).
+
+Off by default; when off, `span()` returns one shared no-op object (no
+context manager is built, nothing is recorded).
+    TRACE=1            enable
+    TRACE_FILE         output path (default .cache/traces.jsonl)
+    TRACE_SERVICE      service.name resource attribute (default course-app)
+"""
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+TRACE = os.getenv("TRACE", "0") == "1"
+TRACE_FILE = os.getenv("TRACE_FILE", os.path.join(".cache", "traces.jsonl"))
+SERVICE_NAME = os.getenv("TRACE_SERVICE", "course-app")
+
+_local = threading.local()        # .stack → open spans, .finished → closed spans of the trace
+_write_lock = threading.Lock()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Spans                                                                        │
+# ──────────────────────────────────────────────────────────────────────────────
+class Span:
+    __slots__ = ("name", "attrs", "trace_id", "span_id", "parent_id",
+                 "start_ns", "end_ns", "error")
+
+    def __init__(self, name, attrs, parent):
+        self.name = name
+        self.attrs = attrs
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else ""
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+
+    def set(self, **attrs):
+        """Add attributes once they are known (row counts, cache hits …)."""
+        self.attrs.update(attrs)
+
+
+class _NoopSpan:
+    """Shared stand-in returned by `span()` while tracing is off."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name, **attrs):
+    """Time the enclosed block as span `name` with `attrs`."""
+    if not TRACE:
+        return _NOOP
+    return _span(name, attrs)
+
+
+@contextmanager
+def _span(name, attrs):
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+        _local.finished = []
+    current = Span(name, attrs, stack[-1] if stack else None)
+    stack.append(current)
+    try:
+        yield current
+    except Exception as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        stack.pop()
+        _local.finished.append(current)
+        if not stack:
+            finished, _local.finished = _local.finished, []
+            _export(finished)
+
+
+def traced(name=None, **attrs):
+    """Decorator form of `span()`; the span is named after the function by default."""
+    def decorate(func):
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TRACE:
+                return func(*args, **kwargs)
+            with span(span_name, **attrs):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# SQL normalization                                                            │
+# ──────────────────────────────────────────────────────────────────────────────
+_SQL_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.|\"\")*\"")
+_SQL_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_SQL_LIST = re.compile(r"\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))+\s*\)")
+
+
+def normalize_sql(operation):
+    """
+    Statement text with literals replaced by `?`, whitespace collapsed and
+    `IN (%s, %s, …)` folded to `IN (?)` – stable across parameter values,
+    so spans group by statement.
+    """
+    if isinstance(operation, (bytes, bytearray)):
+        operation = operation.decode("utf-8", "replace")
+    sql = _SQL_STRING.sub("?", str(operation))
+    sql = _SQL_NUMBER.sub("?", sql)
+    sql = _SQL_LIST.sub("(?)", sql)
+    return " ".join(sql.split()).replace("%s", "?")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# OTLP/JSON file sink                                                          │
+# ──────────────────────────────────────────────────────────────────────────────
+def _attr_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _attributes(attrs):
+    return [{"key": k, "value": _attr_value(v)} for k, v in attrs.items() if v is not None]
+
+
+def _otlp_span(s):
+    out = {
+        "traceId": s.trace_id,
+        "spanId": s.span_id,
+        "name": s.name,
+        "kind": 1,                                  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(s.start_ns),
+        "endTimeUnixNano": str(s.end_ns),
+        "attributes": _attributes(s.attrs),
+        "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+    }
+    if s.parent_id:
+        out["parentSpanId"] = s.parent_id
+    return out
+
+
+def _export(spans):
+    """Append one trace as a single OTLP/JSON line; tracing never breaks a request."""
+    line = json.dumps({
+        "resourceSpans": [{
+            "resource": {"attributes": _attributes({
+                "service.name": SERVICE_NAME,
+                "process.pid": os.getpid(),
+            })},
+            "scopeSpans": [{
+                "scope": {"name": "tracing"},
+                "spans": [_otlp_span(s) for s in spans],
+            }],
+        }],
+    }, separators=(",", ":"))
+    try:
+        with _write_lock:
+            directory = os.path.dirname(TRACE_FILE)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(TRACE_FILE, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+    except OSError:
+        pass
@@ -0,0 +1,89 @@
+# update_tabs.py – shared, mtime-aware loader for `updates/` hot-patch tabs
+"""
+Every week router used to list `updates/` and `exec_module()` each
+`*update.py` file on every rerun.  This registry keeps one process-wide
+cache instead:
+
+  • the directory listing is reused until the folder's mtime changes
+  • each module is executed once and cached under (path, mtime); an edited
+    file is reloaded on the next call, untouched ones are not
+  • load errors are cached too, so a broken file is not re-run per click
+    but its error is still reported on the page
+
+Update modules must define `show()` and a `TAB_TITLE` such as "2.13 Foo";
+the leading "N." decides which week picks it up.
+"""
+import os
+import threading
+import importlib.util
+
+import streamlit as st
+
+_lock = threading.Lock()
+_listing = {"mtime": None, "files": []}   # cached sorted *update.py names
+_modules = {}                              # path → (mtime, module | None, error | None)
+
+
+def _updates_folder():
+    return os.path.join(os.getcwd(), "updates")
+
+
+def _list_update_files(folder):
+    """Return `*update.py` file names, rescanning only when the folder changes."""
+    mtime = os.stat(folder).st_mtime_ns
+    if _listing["mtime"] != mtime:
+        _listing["files"] = sorted(f for f in os.listdir(folder) if f.endswith("update.py"))
+        _listing["mtime"] = mtime
+    return _listing["files"]
+
+
+def _load(path):
+    """Return (module, error) for `path`, executing it only if new or modified."""
+    mtime = os.stat(path).st_mtime_ns
+    cached = _modules.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1], cached[2]
+
+    # Sanitized module name (replace dots with underscores)
+    module_name = os.path.basename(path)[:-3].replace(".", "_")
+    try:
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        entry = (mtime, mod, None)
+    except Exception as e:
+        entry = (mtime, None, e)
+    _modules[path] = entry
+    return entry[1], entry[2]
+
+
+def load_update_tabs(title_prefix, filename_prefix=""):
+    """
+    Return [(TAB_TITLE, show), ...] for update modules whose TAB_TITLE starts
+    with `title_prefix` (e.g. "3.") and whose file name starts with
+    `filename_prefix`.
+    """
+    folder = _updates_folder()
+    if not os.path.isdir(folder):
+        return []
+
+    update_tabs, errors = [], []
+    with _lock:
+        for file in _list_update_files(folder):
+            if not file.startswith(filename_prefix):
+                continue
+            try:
+                mod, error = _load(os.path.join(folder, file))
+            except OSError as e:          # file vanished between listing and stat
+                mod, error = None, e
+            if error is not None:
+                errors.append((file, error))
+                continue
+            if hasattr(mod, "show"):
+                title = getattr(mod, "TAB_TITLE", None)
+                if title and title.startswith(title_prefix):
+                    update_tabs.append((title, mod.show))
+
+    for file, error in errors:
+        st.error(f"Error loading {file}: {error}")
+    return update_tabs
@@ -1,20 +1,18 @@
 # utils/style1.py
-import streamlit as st
+from style_registry import inject_css
+
+PAGE_CSS = """
+/* Example custom styling */
+body {
+    background-color: #121212;
+    color: #fff;
+}
+"""
+
 
 def set_page_style():
     """
     A placeholder style function. 
     You can adjust or add custom CSS here.
     """
-    st.markdown(
-        """
-        <style>
-        /* Example custom styling */
-        body {
-            background-color: #121212;
-            color: #fff;
-        }
-        </style>
-        """,
-        unsafe_allow_html=True
-    )
+    inject_css("page", PAGE_CSS)
@@ -0,0 +1,93 @@
+# week_tabs.py – shared lesson-tab renderer for modules_week1 … modules_week5
+"""
+`st.tabs()` executes the body of every tab on every rerun, hidden or not,
+so a twelve-lesson week built twelve lessons' worth of DataFrames, images
+and iframes per click.
+
+In lazy mode (the default) the week shows a lesson picker instead and
+only the selected lesson's `show()` runs.  Streamlit drops the picker's
+widget state (`week{N}_selected_tab`) whenever the week is not rendered,
+so the selection is also kept under the plain session key
+`_week{N}_lesson` and handed back to the picker: it survives reruns and
+page switches.  Set LAZY_TABS=0 to fall back to the eager `st.tabs()`
+layout.
+"""
+import os
+
+import streamlit as st
+from github_progress import update_user_progress
+from lesson_cache import render_lesson
+from tracing import span
+
+LAZY_TABS = os.getenv("LAZY_TABS", "1") == "1"
+
+
+def safe_rerun():
+    if hasattr(st, "experimental_rerun"):
+        st.experimental_rerun()
+    elif hasattr(st, "rerun"):
+        st.rerun()
+    else:
+        st.error("Streamlit rerun functionality is not available.")
+
+
+def _render_tab(week, i, tab_titles, tab_funcs, progress, username):
+    """Body of one lesson tab: its content (or lock notice) + "Mark as Read"."""
+    if i < progress:
+        with span("tab.render", week=week, tab=i + 1, title=tab_titles[i]):
+            render_lesson(tab_funcs[i])
+    else:
+        st.info("This tab is locked. Please complete previous tabs to unlock.")
+
+    # "Mark as Read" button on the last unlocked tab.
+    if i == progress - 1 and progress < len(tab_titles):
+        key = f"marking_week{week}_tab{i+1}"
+        if key not in st.session_state:
+            st.session_state[key] = False
+        if st.button("Mark as Read", key=f"week{week}_tab{i+1}", disabled=st.session_state[key]):
+            st.session_state[key] = True
+            update_user_progress(username, week, progress + 1)
+            if LAZY_TABS:
+                # Jump straight to the lesson that was just unlocked.
+                st.session_state[f"_week{week}_next_tab"] = i + 1
+            else:
+                st.info("Progress updated. Please click on the next tab to view the content.")
+            safe_rerun()
+
+
+def render_week_tabs(week, tab_titles, tab_funcs, progress, username):
+    """
+    Render a week's lessons.  `progress` is the number of unlocked tabs
+    (at least 1); tabs at index >= progress show a lock notice.
+    """
+    if not LAZY_TABS:
+        for i, tab in enumerate(st.tabs(tab_titles)):
+            with tab:
+                _render_tab(week, i, tab_titles, tab_funcs, progress, username)
+        return
+
+    select_key = f"week{week}_selected_tab"     # widget state: dropped off-page
+    keep_key = f"_week{week}_lesson"             # plain state: survives page switches
+    pending = st.session_state.pop(f"_week{week}_next_tab", None)
+    if pending is not None:
+        selected = pending
+    elif select_key in st.session_state:          # picker alive: the user's click
+        selected = st.session_state[select_key]
+    else:                                         # back from another page
+        # Default to the newest unlocked lesson.
+        selected = st.session_state.get(keep_key, progress - 1)
+    # Clamp stale selections.
+    if not 0 <= selected < len(tab_titles):
+        selected = min(progress, len(tab_titles)) - 1
+    st.session_state[select_key] = selected
+
+    st.radio(
+        "Lesson",
+        options=list(range(len(tab_titles))),
+        format_func=lambda i: tab_titles[i] if i < progress else f"🔒 {tab_titles[i]}",
+        key=select_key,
+        horizontal=True,
+        label_visibility="collapsed",
+    )
+    st.session_state[keep_key] = st.session_state[select_key]
+    _render_tab(week, st.session_state[keep_key], tab_titles, tab_funcs, progress, username)